@@ -5,15 +5,18 @@ Docs service
 ============
 Provides filesystem helpers to read local documentation and enumerate license
 files without any network access. Used by the GUI to render About/Help content.
+Loose docs folders are consulted first, then the packed asset archive.
 
 Key class:
 - DocsService: resolves candidate docs roots and reads text files safely.
 """
 
 from __future__ import annotations
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 import sys
 
+from services.archive import open_archive, DOCS_PREFIX
+
 DOCS_SUBDIR = "docs"
 LICENSES_SUBDIR = "licenses"
 
@@ -44,6 +47,13 @@ class DocsService:
                     return p.read_text(encoding="utf-8")
             except Exception:
                 pass
+        archive = open_archive()
+        data = archive.read(f"{DOCS_PREFIX}/{PurePosixPath(relpath).as_posix()}") if archive else None
+        if data is not None:
+            try:
+                return bytes(data).decode("utf-8")
+            except UnicodeDecodeError:
+                pass
         return ""
 
     def list_license_files(self) -> list[Path]:
@@ -52,4 +62,11 @@ class DocsService:
             lic_dir = root / self.licenses_subdir
             if lic_dir.is_dir():
                 files.extend(sorted(lic_dir.glob("*.txt")))
+        archive = open_archive()
+        if archive:
+            have = {p.name for p in files}
+            prefix = f"{DOCS_PREFIX}/{self.licenses_subdir}"
+            files.extend(
+                PurePosixPath(prefix, n) for n in archive.listdir(prefix) if n.endswith(".txt") and n not in have
+            )
         return files
@@ -0,0 +1,14 @@
+#library/__init__.py
+
+"""
+Library package
+===============
+Tools that work on a whole folder of songs rather than a single conversion.
+
+Re-exports:
+- SongIndex, parse_phrase
+- SongStats, analyze, write_report
+"""
+
+from .index import SongIndex, parse_phrase
+from .analytics import SongStats, analyze, write_report
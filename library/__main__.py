@@ -0,0 +1,197 @@
+#library/__main__.py
+"""
+Library CLI
+===========
+Entrypoint for `python -m library`. Builds and queries a local song index.
+
+Commands:
+- build DIR            index (or incrementally re-index) every *.html / *.sntb below DIR
+- query PHRASE         songs containing a bar sequence, e.g. "1+5 2 - 3+7"
+- query --song F --bars A-B
+                       same, using bars A..B of an existing song as the phrase
+- dupes [--of FILE]    near-duplicate songs (Jaccard over chord n-grams)
+- analyze [--out F]    difficulty metrics for every indexed song (CSV/JSON)
+- songbook FILES...    one HTML document for a whole setlist (or --list setlist.txt)
+- diff OLD NEW         bar-level changes between two versions (--html for a visual report)
+- render FILE          PNG pages of one song (needs Pillow)
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import argparse, sys, time
+
+from main.mapper import encode_bars
+from main.songbook import export_songbook
+from main.raster import render_png_pages
+
+from .index import DEFAULT_N, SongIndex, parse_phrase, load_masks, load_song
+from .analytics import SongStats, analyze, write_report
+from .diff import diff_bars, summarize, export_diff_html
+
+DEFAULT_DB = "sntb-index.sqlite"
+
+def _bar_range(text: str) -> tuple[int, int]:
+    a, _, b = text.partition("-")
+    start, end = int(a), int(b or a)
+    if start < 1 or end < start:
+        raise argparse.ArgumentTypeError(f"Bad bar range: {text!r}")
+    return start, end
+
+def _cmd_build(args) -> int:
+    t0 = time.perf_counter()
+    with SongIndex(args.db, n=args.n) as idx:
+        st = idx.update(args.dir)
+        total = idx.song_count()
+    print(f"{st.added} added, {st.updated} updated, {st.unchanged} unchanged, {st.removed} removed, "
+          f"{len(st.failed)} failed ({total} songs, {time.perf_counter() - t0:.2f}s)")
+    for path, err in st.failed:
+        print(f"  failed: {path}: {err}", file=sys.stderr)
+    return 0
+
+def _cmd_query(args) -> int:
+    if args.song:
+        if not args.bars:
+            print("--song needs --bars A-B", file=sys.stderr)
+            return 2
+        start, end = args.bars
+        phrase = load_masks(Path(args.song))[start - 1:end]
+    else:
+        phrase = parse_phrase(" ".join(args.phrase))
+    if not phrase:
+        print("Empty phrase.", file=sys.stderr)
+        return 2
+    with SongIndex(args.db) as idx:
+        t0 = time.perf_counter()
+        hits = idx.find_phrase(phrase)
+        ms = (time.perf_counter() - t0) * 1000
+    for h in hits:
+        print(f"{h.title}\t{h.path}\tbars {', '.join(map(str, h.bars))}")
+    print(f"{len(hits)} song(s) in {ms:.1f} ms", file=sys.stderr)
+    return 0
+
+def _cmd_dupes(args) -> int:
+    with SongIndex(args.db) as idx:
+        t0 = time.perf_counter()
+        of = load_masks(Path(args.of)) if args.of else None
+        pairs = idx.near_duplicates(threshold=args.threshold, of=of)
+        ms = (time.perf_counter() - t0) * 1000
+    own = str(Path(args.of).resolve()) if args.of else None
+    pairs = [t for t in pairs if t[1] != own]
+    for a, b, score in pairs:
+        print(f"{score:.3f}\t{a or args.of}\t{b}")
+    print(f"{len(pairs)} pair(s) in {ms:.1f} ms", file=sys.stderr)
+    return 0
+
+def _cmd_analyze(args) -> int:
+    with SongIndex(args.db) as idx:
+        t0 = time.perf_counter()
+        stats = analyze(idx.iter_songs(), use_numpy=False if args.no_numpy else None)
+    if args.sort:
+        stats.sort(key=lambda s: getattr(s, args.sort), reverse=not args.ascending)
+    fmt = args.format or ("json" if args.out and args.out.suffix.lower() == ".json" else "csv")
+    out = write_report(stats, args.out or Path(f"sntb-report.{fmt}"), fmt)
+    print(f"{len(stats)} song(s) analyzed in {time.perf_counter() - t0:.2f}s -> {out}")
+    return 0
+
+def _cmd_songbook(args) -> int:
+    paths = [Path(p) for p in args.files]
+    if args.list:
+        lines = args.list.read_text(encoding="utf-8").splitlines()
+        paths += [args.list.parent / ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
+    if not paths:
+        print("No songs given.", file=sys.stderr)
+        return 2
+    t0 = time.perf_counter()
+    out = export_songbook(((p.stem, lambda p=p: load_song(p)) for p in paths),
+                          args.out, title=args.title, profile=args.profile)
+    print(f"{len(paths)} song(s) -> {out} ({time.perf_counter() - t0:.2f}s)")
+    return 0
+
+def _cmd_diff(args) -> int:
+    old_map, new_map = load_song(args.old), load_song(args.new)
+    old, new = encode_bars(old_map), encode_bars(new_map)
+    t0 = time.perf_counter()
+    ops = diff_bars(old, new)
+    ms = (time.perf_counter() - t0) * 1000
+    print(summarize(old, new, ops))
+    print(f"diffed in {ms:.1f} ms", file=sys.stderr)
+    if args.html:
+        title = args.title or f"{Path(args.old).stem} → {Path(args.new).stem}"
+        out = export_diff_html(old_map, new_map, ops, args.html, title=title, profile=args.profile)
+        print(f"HTML report -> {out}", file=sys.stderr)
+    return 0
+
+def _cmd_render(args) -> int:
+    out = args.out or Path(args.file).with_suffix(".png")
+    t0 = time.perf_counter()
+    pages = render_png_pages(load_song(args.file), out, title=args.title or Path(args.file).stem,
+                             profile=args.profile, workers=args.workers)
+    print(f"wrote {len(pages)} page(s) in {time.perf_counter() - t0:.2f} s", file=sys.stderr)
+    for p in pages:
+        print(p)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m library", description="Index and search a folder of Sky songs.")
+    ap.add_argument("--db", default=DEFAULT_DB, help=f"index file (default: {DEFAULT_DB})")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    b = sub.add_parser("build", help="create or incrementally update the index")
+    b.add_argument("dir", type=Path)
+    b.add_argument("-n", type=int, default=DEFAULT_N, help="bars per n-gram for a new index (1..4)")
+    b.set_defaults(func=_cmd_build)
+
+    q = sub.add_parser("query", help="find songs containing a phrase")
+    q.add_argument("phrase", nargs="*", help='bars like "1+5 2 - 3+7" (- = rest)')
+    q.add_argument("--song", help="take the phrase from this song")
+    q.add_argument("--bars", type=_bar_range, help="bar range A-B for --song")
+    q.set_defaults(func=_cmd_query)
+
+    d = sub.add_parser("dupes", help="list near-duplicate songs")
+    d.add_argument("--of", help="compare this song against the library")
+    d.add_argument("--threshold", type=float, default=0.8)
+    d.set_defaults(func=_cmd_dupes)
+
+    a = sub.add_parser("analyze", help="write difficulty metrics for all indexed songs")
+    a.add_argument("--out", type=Path, help="report file (default: sntb-report.csv)")
+    a.add_argument("--format", choices=["csv", "json"], help="default: from --out suffix, else csv")
+    a.add_argument("--sort", choices=[f for f in SongStats.__dataclass_fields__ if f not in {"path", "title"}])
+    a.add_argument("--ascending", action="store_true", help="sort ascending (default: descending)")
+    a.add_argument("--no-numpy", action="store_true", help="force the pure-Python implementation")
+    a.set_defaults(func=_cmd_analyze)
+
+    sb = sub.add_parser("songbook", help="merge many songs into one HTML document")
+    sb.add_argument("files", nargs="*", help="song files (Sky HTML or .sntb), in setlist order")
+    sb.add_argument("--list", type=Path, help="text file with one song path per line (# comments allowed)")
+    sb.add_argument("--out", type=Path, default=Path("songbook.html"))
+    sb.add_argument("--title", default="Songbook")
+    sb.add_argument("--profile", default="", help="icon profile key (default: first available)")
+    sb.set_defaults(func=_cmd_songbook)
+
+    df = sub.add_parser("diff", help="compare two versions of a transcript")
+    df.add_argument("old")
+    df.add_argument("new")
+    df.add_argument("--html", type=Path, help="also write a highlighted HTML report")
+    df.add_argument("--title")
+    df.add_argument("--profile", default="", help="icon profile key for --html")
+    df.set_defaults(func=_cmd_diff)
+
+    r = sub.add_parser("render", help="render one song to PNG pages")
+    r.add_argument("file", help="song file (Sky HTML or .sntb)")
+    r.add_argument("--out", type=Path, help="base name; pages are written as NAME-01.png, ... (default: next to FILE)")
+    r.add_argument("--title")
+    r.add_argument("--profile", default="", help="icon profile key (default: first available)")
+    r.add_argument("--workers", type=int, help="render processes (default: CPU count)")
+    r.set_defaults(func=_cmd_render)
+    return ap
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
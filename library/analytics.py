@@ -0,0 +1,161 @@
+#library/analytics.py
+"""
+Song analytics
+==============
+Difficulty-related metrics for a whole library in one pass over the batched
+chord bitmasks (see `library.index`). Per-mask facts (note count, hand span)
+are precomputed once for all 2^15 chords and then looked up per bar.
+
+NumPy is optional: with it, all songs are concatenated into one uint16 array
+and reduced with bincount/unique; without it, the same metrics are computed
+with plain Python loops.
+
+Metrics per song:
+- bars, notes_per_bar (notes / bars), rest_ratio (silent bars / bars)
+- chord_1 .. chord_4plus: share of played bars by chord size
+- span_mean / span_max: extent of a chord on the 3x5 grid, max(columns, rows)
+  covered - 1 (0 for single notes)
+- repetition_rate: share of played bars whose chord already occurred earlier
+
+Exports:
+- SongStats
+- analyze(songs, use_numpy=None) -> List[SongStats]
+- write_report(stats, out, fmt="csv") -> Path
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+import csv, json
+
+# NumPy (optional)
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+_MASKS = 1 << 15
+
+@lru_cache(maxsize=None)
+def _tables() -> Tuple[List[int], List[int]]:
+    pop = [0] * _MASKS
+    span = [0] * _MASKS
+    for m in range(1, _MASKS):
+        fields_on = [n for n in range(15) if m >> n & 1]
+        cols = [n % 5 for n in fields_on]
+        rows = [n // 5 for n in fields_on]
+        pop[m] = len(fields_on)
+        span[m] = max(max(cols) - min(cols), max(rows) - min(rows))
+    return pop, span
+
+@dataclass(frozen=True)
+class SongStats:
+    path: str
+    title: str
+    bars: int
+    notes_per_bar: float
+    rest_ratio: float
+    chord_1: float
+    chord_2: float
+    chord_3: float
+    chord_4plus: float
+    span_mean: float
+    span_max: int
+    repetition_rate: float
+
+def _ratio(a, b) -> float:
+    return round(float(a) / float(b), 4) if b else 0.0
+
+def _analyze_python(songs: Sequence[Tuple[str, str, Sequence[int]]]) -> List[SongStats]:
+    pop_t, span_t = _tables()
+    out: List[SongStats] = []
+    for path, title, bars in songs:
+        n = len(bars)
+        notes = played = span_sum = span_max = repeats = 0
+        sizes = [0, 0, 0, 0]
+        seen = set()
+        for m in bars:
+            m &= _MASKS - 1
+            if not m:
+                continue
+            played += 1
+            c = pop_t[m]
+            notes += c
+            sizes[min(c, 4) - 1] += 1
+            s = span_t[m]
+            span_sum += s
+            span_max = max(span_max, s)
+            if m in seen:
+                repeats += 1
+            else:
+                seen.add(m)
+        out.append(SongStats(
+            path, title, n, _ratio(notes, n), _ratio(n - played, n),
+            *(_ratio(k, played) for k in sizes), _ratio(span_sum, played), span_max, _ratio(repeats, played),
+        ))
+    return out
+
+def _as_u16(bars):
+    """Zero-copy view for buffers (array('H'), .sntb memoryviews), copy for lists."""
+    try:
+        return np.frombuffer(bars, dtype=np.uint16)
+    except (TypeError, ValueError):
+        return np.asarray(bars, dtype=np.uint16)
+
+def _analyze_numpy(songs: Sequence[Tuple[str, str, Sequence[int]]]) -> List[SongStats]:
+    S = len(songs)
+    lengths = np.fromiter((len(b) for _, _, b in songs), dtype=np.int64, count=S)
+    masks = np.concatenate([_as_u16(b) for _, _, b in songs]) if S else np.zeros(0, np.uint16)
+    masks &= _MASKS - 1
+    seg = np.repeat(np.arange(S), lengths)
+    pop_t, span_t = _tables()
+    pop = np.asarray(pop_t, dtype=np.int64)[masks]
+    span = np.asarray(span_t, dtype=np.int64)[masks]
+    on = masks != 0
+
+    def count(w=None, sel=None):
+        return np.bincount(seg if sel is None else seg[sel], weights=w, minlength=S)
+
+    notes = count(pop)
+    played = count(sel=on)
+    sizes = [count(sel=pop == k) for k in (1, 2, 3)] + [count(sel=pop >= 4)]
+    span_sum = count(span)
+    span_max = np.zeros(S, dtype=np.int64)
+    np.maximum.at(span_max, seg, span)
+    keys = (seg[on].astype(np.int64) << 16) | masks[on]
+    distinct = np.bincount(np.unique(keys) >> 16, minlength=S)
+    repeats = played - distinct
+
+    return [
+        SongStats(
+            path, title, int(lengths[i]), _ratio(notes[i], lengths[i]), _ratio(lengths[i] - played[i], lengths[i]),
+            *(_ratio(k[i], played[i]) for k in sizes), _ratio(span_sum[i], played[i]), int(span_max[i]),
+            _ratio(repeats[i], played[i]),
+        )
+        for i, (path, title, _) in enumerate(songs)
+    ]
+
+def analyze(songs: Iterable[Tuple[str, str, Sequence[int]]], use_numpy: Optional[bool] = None) -> List[SongStats]:
+    """Metrics for every (path, title, bar masks) triple, in input order."""
+    songs = list(songs)
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy is not installed; use the pure-Python path.")
+    return _analyze_numpy(songs) if use_numpy else _analyze_python(songs)
+
+def write_report(stats: Sequence[SongStats], out: str | Path, fmt: str = "csv") -> Path:
+    out = Path(out)
+    if fmt == "json":
+        out.write_text(json.dumps([asdict(s) for s in stats], indent=2, ensure_ascii=False), encoding="utf-8")
+    elif fmt == "csv":
+        with open(out, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow([fl.name for fl in fields(SongStats)])
+            for s in stats:
+                w.writerow(list(asdict(s).values()))
+    else:
+        raise ValueError(f"Unknown report format: {fmt!r} (expected csv or json)")
+    return out
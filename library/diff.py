@@ -0,0 +1,221 @@
+#library/diff.py
+"""
+Bar-level diff
+==============
+Aligns two versions of a transcript by their chord codes (one bitmask per
+bar) and reports which bars were changed, inserted or deleted.
+
+The alignment is Myers' O(ND) algorithm in its linear-space form (recursive
+middle snake) after trimming the common prefix/suffix, so typical revisions
+of 10k-bar songs diff in milliseconds. Cost grows with the number of edits;
+once a middle-snake search exceeds `max_cost` rounds, that region is reported
+as one 'replace' block instead (optimal below the cutoff, bounded time above
+it, like the too-expensive heuristic in GNU diff).
+
+Exports:
+- MAX_COST
+- diff_bars(old, new, max_cost=MAX_COST) -> List[(tag, i1, i2, j1, j2)]   (difflib-style opcodes)
+- summarize(old, new, opcodes) -> str
+- export_diff_html(old_map, new_map, opcodes, out_html, title, profile) -> Path
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import html, logging
+
+from main.exporter import EXPORT_CSS, bar_card_html, icon_fallback_html, _icon_src
+from main.mapper import mask_fields
+from profiles import get_profile, compile_profile
+
+ActiveMapOut = Dict[int, Union[List[int], str]]
+Opcode = Tuple[str, int, int, int, int]
+
+MAX_COST = 1000  # middle-snake rounds per region (~2 x this many edits) before giving up on alignment
+
+def _middle_snake(a: Sequence[int], a0: int, n: int, b: Sequence[int], b0: int, m: int,
+                  vf: List[int], vb: List[int], max_cost: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Return the middle snake (x, y, u, v) of a[a0:a0+n] vs b[b0:b0+m] in local
+    coordinates, or None when it needs more than max_cost rounds. vf/vb are
+    shared scratch buffers (centre index = len // 2) reused across calls.
+    """
+    delta = n - m
+    odd = delta & 1
+    off = len(vf) // 2
+    vf[off + 1] = vb[off + 1] = 0
+    for d in range(min((n + m + 1) // 2, max_cost) + 1):
+        # forward paths
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vf[off + k - 1] < vf[off + k + 1]):
+                x = vf[off + k + 1]
+            else:
+                x = vf[off + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a0 + x] == b[b0 + y]:
+                x += 1; y += 1
+            vf[off + k] = x
+            if odd and -(d - 1) <= delta - k <= d - 1 and x + vb[off + delta - k] >= n:
+                return x0, y0, x, y
+        # backward paths (on the reversed sequences; diagonal k here is delta - k forward)
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vb[off + k - 1] < vb[off + k + 1]):
+                x = vb[off + k + 1]
+            else:
+                x = vb[off + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a0 + n - 1 - x] == b[b0 + m - 1 - y]:
+                x += 1; y += 1
+            vb[off + k] = x
+            if not odd and -d <= delta - k <= d and x + vf[off + delta - k] >= n:
+                return n - x, m - y, n - x0, m - y0
+    return None
+
+def _match_blocks(a: Sequence[int], a0: int, a1: int, b: Sequence[int], b0: int, b1: int,
+                  out: List[Tuple[int, int, int]], vf: List[int], vb: List[int], max_cost: int) -> None:
+    """Append (i, j, length) equal runs of a[a0:a1] / b[b0:b1] in order."""
+    p = 0
+    while a0 + p < a1 and b0 + p < b1 and a[a0 + p] == b[b0 + p]:
+        p += 1
+    if p:
+        out.append((a0, b0, p))
+        a0 += p; b0 += p
+    s = 0
+    while a0 < a1 - s and b0 < b1 - s and a[a1 - 1 - s] == b[b1 - 1 - s]:
+        s += 1
+    tail = (a1 - s, b1 - s, s) if s else None
+    a1 -= s; b1 -= s
+
+    snake = _middle_snake(a, a0, a1 - a0, b, b0, b1 - b0, vf, vb, max_cost) if a0 < a1 and b0 < b1 else None
+    if snake:  # None: too expensive, the whole region stays unmatched
+        x, y, u, v = snake
+        _match_blocks(a, a0, a0 + x, b, b0, b0 + y, out, vf, vb, max_cost)
+        if u > x:
+            out.append((a0 + x, b0 + y, u - x))
+        _match_blocks(a, a0 + u, a1, b, b0 + v, b1, out, vf, vb, max_cost)
+    if tail:
+        out.append(tail)
+
+def diff_bars(old: Sequence[int], new: Sequence[int], max_cost: int = MAX_COST) -> List[Opcode]:
+    """difflib-style opcodes ('equal'/'replace'/'delete'/'insert', i1, i2, j1, j2); indices are 0-based."""
+    blocks: List[Tuple[int, int, int]] = []
+    size = 2 * (len(old) + len(new)) + 5
+    _match_blocks(old, 0, len(old), new, 0, len(new), blocks, [0] * size, [0] * size, max_cost)
+    ops: List[Opcode] = []
+    i = j = 0
+    for bi, bj, size in blocks + [(len(old), len(new), 0)]:
+        if i < bi and j < bj:
+            ops.append(("replace", i, bi, j, bj))
+        elif i < bi:
+            ops.append(("delete", i, bi, j, j))
+        elif j < bj:
+            ops.append(("insert", i, i, j, bj))
+        if size:
+            if ops and ops[-1][0] == "equal":
+                _, e1, _, f1, _ = ops.pop()
+                ops.append(("equal", e1, bi + size, f1, bj + size))
+            else:
+                ops.append(("equal", bi, bi + size, bj, bj + size))
+        i, j = bi + size, bj + size
+    return ops
+
+def _chord(mask: int) -> str:
+    fields = mask_fields(mask)
+    return "-" if fields == "noValue" else "+".join(map(str, fields))
+
+def _span(a: int, b: int) -> str:
+    return f"{a + 1}" if b - a == 1 else f"{a + 1}-{b}"
+
+def summarize(old: Sequence[int], new: Sequence[int], opcodes: Sequence[Opcode]) -> str:
+    """Human-readable report; bar numbers are 1-based. Header totals add up to each version's length."""
+    counts = {"equal": 0, "replace": 0, "delete": 0, "insert": 0}
+    lines: List[str] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            counts["equal"] += i2 - i1
+            continue
+        if tag == "replace":
+            # paired bars count as changed, the unpaired rest as deleted/inserted,
+            # so old = unchanged + changed + deleted and new = unchanged + changed + inserted
+            pairs = min(i2 - i1, j2 - j1)
+            counts["replace"] += pairs
+            counts["delete"] += i2 - i1 - pairs
+            counts["insert"] += j2 - j1 - pairs
+            lines.append(f"changed  old {_span(i1, i2)} -> new {_span(j1, j2)}")
+            for k in range(max(i2 - i1, j2 - j1)):
+                o = _chord(old[i1 + k]) if i1 + k < i2 else "(none)"
+                n = _chord(new[j1 + k]) if j1 + k < j2 else "(none)"
+                lines.append(f"    {o:>12}  ->  {n}")
+        elif tag == "delete":
+            counts["delete"] += i2 - i1
+            lines.append(f"deleted  old {_span(i1, i2)}: {' '.join(_chord(m) for m in old[i1:i2])}")
+        else:
+            counts["insert"] += j2 - j1
+            lines.append(f"inserted new {_span(j1, j2)} (after old bar {i1}): {' '.join(_chord(m) for m in new[j1:j2])}")
+    head = (f"old: {len(old)} bars, new: {len(new)} bars | unchanged {counts['equal']}, changed {counts['replace']}, "
+            f"inserted {counts['insert']}, deleted {counts['delete']}")
+    return "\n".join([head, *lines]) if lines else head + "\nNo differences."
+
+_DIFF_CSS = """
+    .legend { display:flex; gap:14px; font-size:12px; color:#8b929a; margin:0 0 14px; }
+    .legend span { border:2px solid; border-radius:6px; padding:1px 6px; }
+    .card.chg { border:2px solid #e0b14a; }
+    .card.ins { border:2px solid #4ac26b; }
+    .card.del { border:2px dashed #f46666; opacity:.55; }
+    .card.was { border:1px dashed #8b929a; opacity:.45; }
+    .card.del .title, .card.was .title { color:#f46666; text-decoration:line-through; }
+    """
+
+def export_diff_html(old_map: ActiveMapOut, new_map: ActiveMapOut, opcodes: Sequence[Opcode],
+                     out_html: str | Path, title: str = "Transcript diff", profile: str = "") -> Path:
+    """
+    New version laid out like the normal export; changed bars are highlighted
+    and preceded by a dimmed copy of the old bar, inserted bars are marked and
+    deleted bars appear as struck-out ghosts.
+    """
+    prof = get_profile(profile)
+    out_html = Path(out_html)
+    out_dir = out_html.parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+    logging.info("Generating diff HTML (%s) with profile '%s'", out_html, prof.key)
+
+    compiled = compile_profile(prof)
+    icons: Dict[int, str] = {}
+
+    def icon_html(num: int) -> str:
+        if num not in icons:
+            src = _icon_src(num, out_dir, prof, compiled=compiled)
+            label = prof.display_name_for(num)
+            icons[num] = (f"<img class='icon' src='{src}' alt='{label}' title='{label}' />" if src
+                          else icon_fallback_html(prof, label))
+        return icons[num]
+
+    old_keys, new_keys = sorted(old_map), sorted(new_map)
+    def card(keys: List[int], m: ActiveMapOut, k: int, cls: str = "") -> str:
+        return bar_card_html(keys[k], m[keys[k]], prof, icon_html, cls)
+
+    parts: List[str] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            parts.extend(card(new_keys, new_map, j) for j in range(j1, j2))
+            continue
+        pairs = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        for k in range(pairs):
+            parts.append(card(old_keys, old_map, i1 + k, "was"))
+            parts.append(card(new_keys, new_map, j1 + k, "chg"))
+        parts.extend(card(old_keys, old_map, i, "del") for i in range(i1 + pairs, i2))
+        parts.extend(card(new_keys, new_map, j, "ins") for j in range(j1 + pairs, j2))
+
+    esc = html.escape(title)
+    out_html.write_text("".join([
+        "<!doctype html><html><head><meta charset='utf-8'>",
+        f"<title>{esc}</title><style>{EXPORT_CSS}{_DIFF_CSS}</style></head><body>",
+        f"<h1>{esc}</h1><div class='sub'>Profile: {prof.label}</div>",
+        "<div class='legend'><span style='border-color:#e0b14a'>changed</span>"
+        "<span style='border-color:#4ac26b'>inserted</span><span style='border-color:#f46666'>deleted</span>"
+        "<span style='border-color:#8b929a'>old version of a changed bar</span></div>",
+        "<div class='wrap'>", *parts, "</div><footer>Generated by diff.py</footer></body></html>",
+    ]), encoding="utf-8")
+    return out_html
@@ -0,0 +1,353 @@
+#library/index.py
+"""
+Song library index
+==================
+SQLite-backed index over a folder of songs (Sky HTML or .sntb). Each song is stored
+once as a compact bar sequence (one little-endian uint16 chord bitmask per
+bar, see `main.mapper.encode_bars`) plus an inverted index of chord n-grams,
+so phrase and near-duplicate queries never touch the source HTML again.
+
+Updates are incremental: a file is only re-parsed when its size or mtime
+changes, and songs whose files disappeared are dropped. Each song's gram count
+and each gram's document frequency are kept up to date as songs come and go,
+so similarity queries only read the postings they need.
+
+Exports:
+- DEFAULT_N
+- SongIndex(db_path, n=DEFAULT_N)
+- parse_phrase(text) -> List[int]
+- load_song(path) -> mapped ActiveMap / load_masks(path) -> List[int]
+- pack_bars(masks) -> bytes / unpack_bars(blob) -> array('H')
+"""
+
+from __future__ import annotations
+from array import array
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from itertools import combinations
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+import logging, sqlite3, sys
+
+from main.loader import load_active_map
+from main.mapper import map_active_map, encode_bars, chord_mask
+from main.sntb import SNTB_SUFFIX, SntbSong, load_sntb
+
+DEFAULT_N = 4      # bars per n-gram; 4 x 15-bit masks still fit one SQLite INTEGER
+SONG_SUFFIXES = (".html", ".htm", SNTB_SUFFIX)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta  (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS songs (
+    id         INTEGER PRIMARY KEY,
+    path       TEXT UNIQUE NOT NULL,
+    title      TEXT NOT NULL,
+    mtime_ns   INTEGER NOT NULL,
+    size       INTEGER NOT NULL,
+    bar_count  INTEGER NOT NULL,
+    bars       BLOB NOT NULL,
+    gram_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS grams (
+    gram    INTEGER NOT NULL,
+    song_id INTEGER NOT NULL REFERENCES songs(id) ON DELETE CASCADE,
+    PRIMARY KEY (gram, song_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS grams_by_song ON grams(song_id);
+CREATE TABLE IF NOT EXISTS gram_df (
+    gram INTEGER PRIMARY KEY,
+    df   INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS grams_df_add AFTER INSERT ON grams BEGIN
+    INSERT INTO gram_df(gram, df) VALUES (new.gram, 1) ON CONFLICT(gram) DO UPDATE SET df = df + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS grams_df_drop AFTER DELETE ON grams BEGIN
+    UPDATE gram_df SET df = df - 1 WHERE gram = old.gram;
+    DELETE FROM gram_df WHERE gram = old.gram AND df = 0;
+END;
+"""
+_BATCH = 500       # host parameters per IN (...) list
+
+@dataclass
+class UpdateStats:
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+
+@dataclass(frozen=True)
+class PhraseHit:
+    path: str
+    title: str
+    bars: List[int]  # 1-based bar numbers where the phrase starts
+
+def pack_bars(masks: Sequence[int]) -> bytes:
+    a = array("H", masks)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a.tobytes()
+
+def unpack_bars(blob: bytes) -> array:
+    a = array("H")
+    a.frombytes(blob)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a
+
+def _grams(masks: Sequence[int], n: int) -> Set[int]:
+    out: Set[int] = set()
+    for i in range(len(masks) - n + 1):
+        key = 0
+        for m in masks[i:i + n]:
+            key = (key << 15) | m
+        out.add(key)
+    return out
+
+def parse_phrase(text: str) -> List[int]:
+    """
+    Parse a phrase like "1+5 2 - 3+7": bars separated by whitespace or commas,
+    fields within a bar joined by '+', and '-' / 'rest' for a silent bar.
+    """
+    masks: List[int] = []
+    for token in text.replace(",", " ").split():
+        if token.lower() in {"-", "rest"}:
+            masks.append(0)
+            continue
+        try:
+            nums = [int(t) for t in token.split("+")]
+        except ValueError:
+            raise ValueError(f"Bad bar in phrase: {token!r}") from None
+        if not all(1 <= n <= 15 for n in nums):
+            raise ValueError(f"Field numbers must be 1..15: {token!r}")
+        masks.append(chord_mask(nums))
+    return masks
+
+def _find_all(haystack: bytes, needle: bytes) -> List[int]:
+    """Bar offsets of every 2-byte-aligned occurrence of needle."""
+    hits: List[int] = []
+    i = haystack.find(needle)
+    while i != -1:
+        if i % 2 == 0:
+            hits.append(i // 2)
+        i = haystack.find(needle, i + 1)
+    return hits
+
+def load_song(path: str | Path) -> Dict[int, Union[List[int], str]]:
+    """Load + map one song file (Sky HTML or .sntb); HTML is parsed in lean mode."""
+    path = Path(path)
+    if path.suffix.lower() == SNTB_SUFFIX:
+        return map_active_map(load_sntb(str(path)))
+    return map_active_map(load_active_map(str(path), lean=True))
+
+def load_masks(path: Path) -> List[int]:
+    """Parse one song file (Sky HTML or .sntb) into chord bitmasks."""
+    if path.suffix.lower() == SNTB_SUFFIX:
+        with SntbSong(path) as song:
+            return song.bars.tolist()
+    return encode_bars(load_song(path))
+
+class SongIndex:
+    def __init__(self, db_path: str | Path, n: int = DEFAULT_N):
+        if not 1 <= n <= 4:
+            raise ValueError("n-gram size must be between 1 and 4 bars.")
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'n'").fetchone()
+        if row is None:
+            with self.conn:
+                self.conn.execute("INSERT INTO meta(key, value) VALUES ('n', ?)", (str(n),))
+            self.n = n
+        else:
+            self.n = int(row[0])
+            if self.n != n:
+                logging.info("Index %s uses %d-grams; ignoring requested n=%d", self.db_path, self.n, n)
+        if "gram_count" not in {r[1] for r in self.conn.execute("PRAGMA table_info(songs)")}:
+            self._add_gram_stats()
+
+    def _add_gram_stats(self) -> None:
+        """One-off upgrade of an index written before gram counts were stored."""
+        logging.info("Upgrading index %s: storing gram counts", self.db_path)
+        with self.conn:
+            self.conn.execute("ALTER TABLE songs ADD COLUMN gram_count INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute("UPDATE songs SET gram_count = (SELECT COUNT(*) FROM grams WHERE song_id = songs.id)")
+            self.conn.execute("DELETE FROM gram_df")
+            self.conn.execute("INSERT INTO gram_df(gram, df) SELECT gram, COUNT(*) FROM grams GROUP BY gram")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "SongIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------- updates
+    def add_song(self, path: str | Path, masks: Sequence[int], title: str = "",
+                 mtime_ns: int = 0, size: int = 0) -> int:
+        """Insert or replace one song and its n-grams; returns the song id."""
+        key = str(Path(path).resolve())
+        grams = _grams(masks, self.n)
+        with self.conn:
+            self.conn.execute("DELETE FROM songs WHERE path = ?", (key,))
+            cur = self.conn.execute(
+                "INSERT INTO songs(path, title, mtime_ns, size, bar_count, bars, gram_count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, title or Path(path).stem, mtime_ns, size, len(masks), pack_bars(masks), len(grams)),
+            )
+            song_id = cur.lastrowid
+            self.conn.executemany("INSERT INTO grams(gram, song_id) VALUES (?, ?)", ((g, song_id) for g in grams))
+        return song_id
+
+    def add_file(self, path: str | Path, loader: Callable[[Path], List[int]] = load_masks) -> int:
+        p = Path(path)
+        st = p.stat()
+        return self.add_song(p, loader(p), p.stem, st.st_mtime_ns, st.st_size)
+
+    def remove(self, path: str | Path) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM songs WHERE path = ?", (str(Path(path).resolve()),))
+
+    def update(self, root: str | Path, loader: Callable[[Path], List[int]] = load_masks) -> UpdateStats:
+        """Bring the index in sync with every song file below root."""
+        root = Path(root).resolve()
+        stats = UpdateStats()
+        known: Dict[str, Tuple[int, int]] = {
+            p: (m, s) for p, m, s in self.conn.execute("SELECT path, mtime_ns, size FROM songs")
+        }
+        seen: Set[str] = set()
+        for p in sorted(root.rglob("*")):
+            if p.suffix.lower() not in SONG_SUFFIXES or not p.is_file():
+                continue
+            key = str(p.resolve())
+            seen.add(key)
+            st = p.stat()
+            if known.get(key) == (st.st_mtime_ns, st.st_size):
+                stats.unchanged += 1
+                continue
+            try:
+                self.add_song(p, loader(p), p.stem, st.st_mtime_ns, st.st_size)
+            except Exception as e:
+                logging.info("Skipping %s: %s", p, e)
+                stats.failed.append((key, str(e)))
+                if key in known:
+                    self.remove(p)  # don't keep serving bars the file no longer has
+                continue
+            if key in known:
+                stats.updated += 1
+            else:
+                stats.added += 1
+
+        gone = [k for k in known if k not in seen and Path(k).is_relative_to(root)]
+        with self.conn:
+            self.conn.executemany("DELETE FROM songs WHERE path = ?", ((k,) for k in gone))
+        stats.removed = len(gone)
+        return stats
+
+    # ------- queries
+    def song_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM songs").fetchone()[0]
+
+    def iter_songs(self) -> Iterable[Tuple[str, str, array]]:
+        """Yield (path, title, bars) for every indexed song."""
+        for path, title, blob in self.conn.execute("SELECT path, title, bars FROM songs ORDER BY path"):
+            yield path, title, unpack_bars(blob)
+
+    def _candidates(self, grams: Set[int]) -> Optional[Set[int]]:
+        """Song ids containing every gram, rarest posting list first (None = no filter)."""
+        if not grams:
+            return None
+        postings = [
+            {r[0] for r in self.conn.execute("SELECT song_id FROM grams WHERE gram = ?", (g,))} for g in grams
+        ]
+        postings.sort(key=len)
+        result = postings[0]
+        for s in postings[1:]:
+            if not result:
+                break
+            result &= s
+        return result
+
+    def find_phrase(self, phrase: Sequence[int]) -> List[PhraseHit]:
+        """Songs containing the exact bar sequence, with start bars."""
+        if not phrase:
+            return []
+        ids = self._candidates(_grams(phrase, self.n))
+        if ids is None:
+            rows = self.conn.execute("SELECT path, title, bars FROM songs")
+        else:
+            if not ids:
+                return []
+            marks = ",".join("?" * len(ids))
+            rows = self.conn.execute(f"SELECT path, title, bars FROM songs WHERE id IN ({marks})", tuple(ids))
+        needle = pack_bars(phrase)
+        hits = []
+        for path, title, blob in rows:
+            starts = _find_all(blob, needle)
+            if starts:
+                hits.append(PhraseHit(path, title, [s + 1 for s in starts]))
+        return sorted(hits, key=lambda h: h.path)
+
+    def near_duplicates(self, threshold: float = 0.8, of: Optional[Sequence[int]] = None,
+                        max_df: float = 0.05) -> List[Tuple[str, str, float]]:
+        """
+        Pairs of songs whose n-gram sets have Jaccard similarity >= threshold.
+        With `of`, compare that bar sequence against the library instead
+        (the first element of each result is then "").
+        Grams found in more than `max_df` of all songs (runs of rests, common
+        fills) are ignored so they neither dominate scores nor blow up the join.
+        """
+        total = self.song_count()
+        if total == 0:
+            return []
+        cutoff = max(2, int(total * max_df))
+        songs = {sid: (path, count) for sid, path, count in self.conn.execute("SELECT id, path, gram_count FROM songs")}
+
+        shared: Counter = Counter()
+        if of is not None:
+            query = sorted(_grams(of, self.n))
+            size = len(query)
+            for i in range(0, len(query), _BATCH):
+                batch = query[i:i + _BATCH]
+                marks = ",".join("?" * len(batch))
+                size -= self.conn.execute(
+                    f"SELECT COUNT(*) FROM gram_df WHERE gram IN ({marks}) AND df > ?", (*batch, cutoff)).fetchone()[0]
+                for sid, common in self.conn.execute(
+                        f"SELECT g.song_id, COUNT(*) FROM grams g JOIN gram_df d ON d.gram = g.gram "
+                        f"WHERE g.gram IN ({marks}) AND d.df <= ? GROUP BY g.song_id", (*batch, cutoff)):
+                    shared[(0, sid)] += common
+            # a song has at least `common` non-stop grams, so common / size bounds its score
+            shared = Counter({pair: common for pair, common in shared.items() if common >= threshold * size})
+            stopped = self._stop_counts(cutoff, [sid for _, sid in shared])
+            songs[0] = ("", size)
+        else:
+            # only grams shared by 2..cutoff songs can pair anything up
+            postings: Dict[int, List[int]] = defaultdict(list)
+            for g, sid in self.conn.execute(
+                    "SELECT g.gram, g.song_id FROM gram_df d JOIN grams g ON g.gram = d.gram "
+                    "WHERE d.df BETWEEN 2 AND ? ORDER BY g.gram, g.song_id", (cutoff,)):
+                postings[g].append(sid)
+            for ids in postings.values():
+                shared.update(combinations(ids, 2))
+            stopped = self._stop_counts(cutoff)
+
+        sizes = {sid: count - stopped.get(sid, 0) for sid, (_, count) in songs.items()}
+        out = [
+            (songs[a][0], songs[b][0], score) for (a, b), common in shared.items()
+            if (score := common / (sizes[a] + sizes[b] - common)) >= threshold
+        ]
+        return sorted(out, key=lambda t: (-t[2], t[0], t[1]))
+
+    def _stop_counts(self, cutoff: int, ids: Optional[List[int]] = None) -> Dict[int, int]:
+        """Per song id, how many of its grams are stop-grams (in more than `cutoff` songs)."""
+        sql = "SELECT song_id, COUNT(*) FROM grams WHERE gram IN (SELECT gram FROM gram_df WHERE df > ?)"
+        if ids is None:
+            return dict(self.conn.execute(sql + " GROUP BY song_id", (cutoff,)))
+        out: Dict[int, int] = {}
+        for i in range(0, len(ids), _BATCH):
+            batch = ids[i:i + _BATCH]
+            out.update(self.conn.execute(
+                f"{sql} AND song_id IN ({','.join('?' * len(batch))}) GROUP BY song_id", (cutoff, *batch)))
+        return out
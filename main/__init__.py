@@ -1,4 +1,5 @@
 #main/__init__.py
 
-__all__ = ["__version__"]
+__all__ = ["__version__", "DEFAULT_TITLE"]
 __version__ = "2.0.1"
+DEFAULT_TITLE = "Sky: Notes to Buttons"   # export title when none is given
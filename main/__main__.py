@@ -2,21 +2,107 @@
 """
 CLI launcher
 ============
-Entrypoint for `python -m main`. Wires up services and starts the Tk GUI.
+Entrypoint for `python -m main`.
+
+- no arguments                 wire up services and start the Tk GUI
+- convert IN [OUT]             convert one file; forwarded to a running daemon
+                               when there is one, otherwise done in-process
+- daemon [--idle-timeout S]    keep the pipeline warm for `convert` calls
+- daemon --refresh | --stop    ask a running daemon to re-discover profiles / exit
+
+The GUI and pipeline are imported lazily so `convert` stays a thin client.
 """
-from main.app import App
-from services.conversion import ConversionService
-from docs.service import DocsService
+import argparse, sys
+from pathlib import Path
 
-from main.loader import load_active_map
-from main.mapper import map_active_map
-from main.exporter import export_html_stack
+from main import __version__ as APP_VERSION, DEFAULT_TITLE
 
-from main import __version__ as APP_VERSION
+def _run_gui() -> int:
+    from main.app import App
+    from services.conversion import ConversionService
+    from docs.service import DocsService
+
+    from main.loader import load_active_map
+    from main.mapper import map_active_map
+    from main.exporter import export_html_stack
 
-if __name__ == "__main__":
     print(f"Launching Sky: Notes → Buttons v{APP_VERSION} ...")
     App(
         conversion=ConversionService(load_active_map, map_active_map, export_html_stack),
         docs=DocsService(),
     ).mainloop()
+    return 0
+
+def _cmd_convert(args) -> int:
+    from services.daemon import convert_via_daemon
+
+    out = args.out or args.input.with_name(f"{args.input.stem}_{args.profile or 'xbox'}_buttons.html")
+    if not args.no_daemon:
+        path = convert_via_daemon(args.input, out, args.title, args.profile)
+        if path is not None:
+            print(path)
+            return 0
+
+    from services.conversion import ConversionService
+    from main.loader import load_active_map
+    from main.mapper import map_active_map
+    from main.exporter import export_html_stack
+
+    service = ConversionService(load_active_map, map_active_map, export_html_stack)
+    print(service.convert(str(args.input), out, title=args.title, profile=args.profile))
+    return 0
+
+def _cmd_daemon(args) -> int:
+    import logging
+    from services.daemon import serve, request
+
+    if args.refresh or args.stop:
+        reply = request({"op": "refresh" if args.refresh else "stop"}, args.socket, timeout=30.0)
+        if reply is None:
+            print("No daemon is running.", file=sys.stderr)
+            return 1
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error") or "Daemon request failed.")
+        print("Profiles: " + ", ".join(reply["profiles"]) if args.refresh else f"Stopped daemon (pid {reply['pid']}).")
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    serve(args.socket, idle_timeout=args.idle_timeout)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    from services.daemon import DEFAULT_IDLE_TIMEOUT
+
+    ap = argparse.ArgumentParser(prog="python -m main", description="Sky: Notes → Buttons")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    c = sub.add_parser("convert", help="convert one Sky HTML file")
+    c.add_argument("input", type=Path)
+    c.add_argument("out", type=Path, nargs="?", help="default: <input>_<profile>_buttons.html")
+    c.add_argument("--profile", default="", help="icon profile key (default: first available)")
+    c.add_argument("--title", default=DEFAULT_TITLE)
+    c.add_argument("--no-daemon", action="store_true", help="always convert in this process")
+    c.set_defaults(func=_cmd_convert)
+
+    d = sub.add_parser("daemon", help="serve convert requests from a warm process")
+    d.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT, help="seconds before exiting when idle")
+    d.add_argument("--socket", type=Path, help="socket path (default: per-user runtime dir)")
+    ops = d.add_mutually_exclusive_group()
+    ops.add_argument("--refresh", action="store_true", help="make a running daemon re-discover profiles")
+    ops.add_argument("--stop", action="store_true", help="stop a running daemon")
+    d.set_defaults(func=_cmd_daemon)
+    return ap
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        return _run_gui()
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
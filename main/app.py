@@ -5,6 +5,7 @@ GUI application (Tk)
 Top-level Tkinter window and UI wiring:
 - File picking and export path derivation
 - Profile selection and validation display
+- In-app preview of the parsed sheet (parsed once per input file)
 - Help/About/Version menu items (no auto-update checks)
 - Delegates conversion to ConversionService (loader → mapper → exporter)
 """
@@ -15,16 +16,17 @@ logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from pathlib import Path
-import webbrowser, sys
+import webbrowser, sys, threading
 
 # services
 from services.conversion import ConversionService
 from docs.service import DocsService
 from ui.dialogs import show_text_dialog
-from main import __version__ as APP_VERSION
+from ui.preview import SheetPreview
+from main import __version__ as APP_VERSION, DEFAULT_TITLE
 
 # profiles
-from profiles import PROFILES, get_profile_report, refresh_profiles, ASSETS_DIR
+from profiles import PROFILES, get_profile, get_profile_report, refresh_profiles, ASSETS_DIR
 
 APP_TITLE   = "Sky: Notes → Buttons"
 
@@ -50,7 +52,7 @@ class App(tk.Tk):
         self.docs = docs
 
         self.title(APP_TITLE)
-        self.minsize(560, 280)
+        self.minsize(560, 480)
 
         # icon
         try:
@@ -111,9 +113,13 @@ class App(tk.Tk):
 
         self.status = ttk.Label(frm, text="Ready.", foreground="#5a6")
         self.status.grid(row=5, column=0, columnspan=3, sticky="w", **pad)
+        self.preview = SheetPreview(frm)
+        self.preview.grid(row=6, column=0, columnspan=3, sticky="nsew", padx=10, pady=(0, 10))
         frm.columnconfigure(1, weight=1)
+        frm.rowconfigure(6, weight=1)
 
         self._update_profile_warning()
+        self.preview.set_profile(get_profile(self.profile_var.get()))
 
     # ------- styles
     def _apply_fallback_style(self):
@@ -166,7 +172,7 @@ class App(tk.Tk):
                 licenses_menu.add_command(
                     label=title,
                     command=lambda path=p: show_text_dialog(
-                        self, f"License — {path.stem}", path.read_text(encoding="utf-8", errors="ignore")
+                        self, f"License — {path.stem}", self.docs.read_text(f"{self.docs.licenses_subdir}/{path.name}")
                     ),
                 )
         else:
@@ -193,6 +199,7 @@ class App(tk.Tk):
     def _open_profiles_folder(self):
         path = ASSETS_DIR
         try:
+            path.mkdir(parents=True, exist_ok=True)  # may only exist inside the asset archive
             if sys.platform.startswith("win"):
                 import os; os.startfile(path)  # type: ignore[attr-defined]
             elif sys.platform == "darwin":
@@ -206,6 +213,8 @@ class App(tk.Tk):
         key = (self.profile_var.get() or "").strip()
         rep = get_profile_report(key)
         message = "OK: profile has 1.png–15.png and no out-of-range files." if rep.valid else ("\n".join(rep.problems) or "Invalid profile.")
+        if rep.warnings:
+            message += "\n\nWarnings:\n" + "\n".join(rep.warnings)
         show_text_dialog(self, f"Profile validation — {key}", message)
 
     def _refresh_profiles(self, _evt=None):
@@ -215,6 +224,8 @@ class App(tk.Tk):
         if self.profile_var.get() not in values:
             self.profile_var.set(values[0] if values else "")
         self._update_profile_warning()
+        self.preview.clear_cache()
+        self.preview.set_profile(get_profile(self.profile_var.get()))
 
     def _on_profile_change(self, _evt=None):
         in_file = self.in_path.get().strip()
@@ -223,6 +234,7 @@ class App(tk.Tk):
             prof = (self.profile_var.get() or "xbox").strip()
             self.out_path.set(str(Path(in_file).with_name(f"{stem}_{prof}_buttons.html")))
         self._update_profile_warning()
+        self.preview.set_profile(get_profile(self.profile_var.get()))
 
     def _update_profile_warning(self):
         key = (self.profile_var.get() or "").strip()
@@ -264,6 +276,38 @@ class App(tk.Tk):
                 prof = (self.profile_var.get() or "xbox").strip()
                 self.out_path.set(str(Path(path).with_name(f"{stem}_{prof}_buttons.html")))
                 self._out_is_auto = True
+            self._load_preview(path)
+
+    def _load_preview(self, path: str):
+        """Parse + map the input once on a worker thread; the preview keeps the result."""
+        self.status.config(text="Loading preview…")
+        result: dict = {}
+        profile = self.profile_var.get()  # Tk variables may only be read on the main thread
+
+        def work():
+            try:
+                raw = self.conversion.loader(path)
+                result["map"] = self.conversion.mapper(raw, profile=profile)
+            except Exception as e:
+                result["error"] = e
+
+        def poll():
+            if worker.is_alive():
+                self.after(50, poll)
+                return
+            if self.in_path.get() != path:
+                return  # another file was picked meanwhile
+            if "error" in result:
+                logging.info("Preview failed: %s", result["error"])
+                self.preview.set_mapping(None)
+                self.status.config(text=f"Preview failed: {result['error']}")
+            else:
+                self.preview.set_mapping(result["map"])
+                self.status.config(text=f"Loaded {len(result['map'])} bars.")
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        self.after(50, poll)
 
     def pick_output(self):
         path = filedialog.asksaveasfilename(title="Save export as", defaultextension=".html", filetypes=[("HTML", "*.html")])
@@ -286,7 +330,7 @@ class App(tk.Tk):
         try:
             self.start_btn.config(state="disabled")
             self.status.config(text="Working…")
-            out_path = self.conversion.convert(in_file, out_file, title="Sky: Notes to Buttons", profile=profile)
+            out_path = self.conversion.convert(in_file, out_file, title=DEFAULT_TITLE, profile=profile)
             self.status.config(text=f"Done → {out_path}")
             if messagebox.askyesno("Open export?", "Export complete. Open in browser?"):
                 webbrowser.open(Path(out_path).resolve().as_uri())
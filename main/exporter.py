@@ -4,58 +4,46 @@
 HTML exporter
 =============
 Builds a static HTML page representing the mapped bars using a selected
-icon profile. Resolves relative paths to numbered PNG icons.
+icon profile. Icons are inlined from the profile's compiled (display-sized)
+derivatives, or referenced by relative path to the original PNGs.
 
 Exports:
 - export_html_stack(mapping, out_html, title, profile) -> Path
+- EXPORT_CSS, bar_card_html(t_idx, val, profile, icon_html): shared with the songbook/diff exporters
 """
 
 
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, List, Union, Optional
+from typing import Callable, Dict, List, Union, Optional
 import os
 import logging
-import base64, mimetypes
+import base64
 
 
-from profiles import get_profile, Profile
+from profiles import get_profile, compile_profile, Profile
 
 ActiveMapOut = Dict[int, Union[List[int], str]]
 
-def _icon_src(num: int, out_dir: Path, profile: Profile, mode: str = "data") -> Optional[str]:
-    p = profile.icon_path(num)
-    if not p:
-        return None
-    p = Path(p)
+def _icon_src(num: int, out_dir: Path, profile: Profile, mode: str = "data",
+              compiled: Optional[Dict[int, Path]] = None) -> Optional[str]:
     if mode == "data":
+        p = (compiled or {}).get(num)
         try:
-            b = p.read_bytes()
+            b = p.read_bytes() if p else profile.icon_bytes(num)
         except OSError:
+            b = profile.icon_bytes(num)
+        if b is None:
             return None
-        mime = mimetypes.guess_type(str(p))[0] or "image/png"
         b64 = base64.b64encode(b).decode("ascii")
-        return f"data:{mime};base64,{b64}"
-    else:
-        return Path(os.path.relpath(p, out_dir)).as_posix()
-
-
-def export_html_stack(mapping: ActiveMapOut,
-                      out_html: str | Path = None,
-                      title: str = "Harp Export",
-                      profile: str = "") -> Path:
-    """Write the export HTML and return its path."""
-    prof = get_profile(profile)
-
-    if out_html is None:
-        out_html = Path(__file__).resolve().parents[1] / "export" / "export.html"
-    out_html = Path(out_html)
-    out_dir = out_html.parent
-    out_dir.mkdir(parents=True, exist_ok=True)
+        return f"data:image/png;base64,{b64}"
+    p = profile.icon_path(num)
+    if not p:
+        return None
+    return Path(os.path.relpath(p, out_dir)).as_posix()
 
-    logging.info("Generating HTML (%s) with profile '%s'", out_html, prof.key)
 
-    css = """
+EXPORT_CSS = """
     * { box-sizing:border-box; }
     body { background:#1e242b; color:#dfe3e6; font-family:ui-sans-serif,system-ui,Segoe UI,Arial; margin:0; padding:18px; }
     h1 { font-size:22px; margin:0 0 4px; font-weight:700; letter-spacing:.2px; }
@@ -75,34 +63,59 @@ def export_html_stack(mapping: ActiveMapOut,
     footer { margin-top:12px; font-size:12px; color:#8b929a; }
     """
 
+def icon_fallback_html(profile: Profile, label: str) -> str:
+    if profile.text_fallback:
+        return f"<div class='badge' title='{label}'>{label}</div>"
+    return "<span class='icon' aria-hidden='true'></span>"
+
+def bar_card_html(t_idx: int, val: Union[List[int], str], profile: Profile,
+                  icon_html: Callable[[int], str], extra_class: str = "") -> str:
+    """One `.card` for a bar; icon_html(num) renders a single icon."""
+    html: List[str] = [f"<div class='card{' ' + extra_class if extra_class else ''}'>"]
+    html.append(f"<div class='title'>Bar {t_idx}</div>")
+    if val == "noValue":
+        html.append(f"<div class='rest'>{profile.rest_label}</div>")
+    else:
+        html.append("<div class='stack'>")
+        html.extend(icon_html(num) for num in val)  # numbers 1..15
+        html.append("</div>")
+    html.append("</div>")
+    return "".join(html)
+
+def export_html_stack(mapping: ActiveMapOut,
+                      out_html: str | Path = None,
+                      title: str = "Harp Export",
+                      profile: str = "") -> Path:
+    """Write the export HTML and return its path."""
+    prof = get_profile(profile)
+
+    if out_html is None:
+        out_html = Path(__file__).resolve().parents[1] / "export" / "export.html"
+    out_html = Path(out_html)
+    out_dir = out_html.parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    logging.info("Generating HTML (%s) with profile '%s'", out_html, prof.key)
+    compiled = compile_profile(prof)
+    icons: Dict[int, str] = {}  # each icon is read/encoded once per export
+
+    def icon_html(num: int) -> str:
+        if num not in icons:
+            src = _icon_src(num, out_dir, prof, compiled=compiled)
+            label = prof.display_name_for(num)
+            icons[num] = (f"<img class='icon' src='{src}' alt='{label}' title='{label}' />" if src
+                          else icon_fallback_html(prof, label))
+        return icons[num]
+
     html: List[str] = []
     html.append("<!doctype html><html><head><meta charset='utf-8'>")
-    html.append(f"<title>{title}</title><style>{css}</style></head><body>")
+    html.append(f"<title>{title}</title><style>{EXPORT_CSS}</style></head><body>")
     html.append(f"<h1>{title}</h1>")
     html.append(f"<div class='sub'>Profile: {prof.label}</div>")
     html.append("<div class='wrap'>")
 
     for t_idx in sorted(mapping.keys()):
-        val = mapping[t_idx]
-        html.append("<div class='card'>")
-        html.append(f"<div class='title'>Bar {t_idx}</div>")
-
-        if val == "noValue":
-            html.append(f"<div class='rest'>{prof.rest_label}</div>")
-        else:
-            html.append("<div class='stack'>")
-            for num in val:  # numbers 1..15
-                src = _icon_src(num, out_dir, prof)
-                label = prof.display_name_for(num)
-                if src:
-                    html.append(f"<img class='icon' src='{src}' alt='{label}' title='{label}' />")
-                else:
-                    if prof.text_fallback:
-                        html.append(f"<div class='badge' title='{label}'>{label}</div>")
-                    else:
-                        html.append("<span class='icon' aria-hidden='true'></span>")
-            html.append("</div>")
-        html.append("</div>")
+        html.append(bar_card_html(t_idx, mapping[t_idx], prof, icon_html))
 
     html.append("</div><footer>Generated by exporter.py</footer></body></html>")
     out_html.write_text("".join(html), encoding="utf-8")
@@ -4,21 +4,42 @@ HTML loader
 ===========
 Parses saved Sky HTML and extracts "active note" maps per bar.
 
+The HTML flavor is chosen before parsing: each registered flavor declares a
+byte-level signature that is matched against the first SNIFF_BYTES of the
+file, so the full parse runs once and only for a recognised document.
+
 Exports:
-- load_active_map(html_path) -> Dict[int, Union[List[int], "noValue"]]
+- load_active_map(html_path, lean=False) -> Dict[int, Union[List[int], "noValue"]]
   Returns a map from bar index to active field numbers (1..15), or "noValue"
   when the bar is silent.
+- Flavor, FLAVORS, register_flavor(name, signature, parse, stream=None), sniff_flavors(data)
+
+Lean mode (`lean=True`) uses a flavor's `stream` scanner when it has one: a
+single pass over the parser events that classifies cells from attributes and
+class tokens only, so no tree or serialized subtree is ever built. The old
+table flavor has one; peak memory drops from tens of times the file size to
+about the file itself (see maintenance/bench_loader_memory.py). Where the
+two modes can disagree:
+- "ON-n" in text content (e.g. <style>) counts in tree mode only.
+- Malformed unclosed cells such as `<td><svg class=button-3/><td>...` (the
+  unquoted value swallows the "/", so the <svg> never closes): the tree
+  nests the following cells inside that <svg> and credits their ON markers
+  to it as well, while lean mode ends the cell at the next <td>.
 """
 
 from __future__ import annotations
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Union
-import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Pattern, Union
+import codecs, gc, re
 
 from bs4 import BeautifulSoup, Tag
 
 ActiveMap = Dict[int, Union[List[int], str]]
 
+_GC_AFTER_BYTES = 1 << 20   # collect the dropped tree right away only for inputs at least this large
+
 _ON_PATTERN = re.compile(r"\bON-\d+\b")
 
 def _is_cell_on(svg) -> bool:
@@ -71,7 +92,119 @@ def _parse_tables(root: Tag) -> ActiveMap:
         result[t_idx] = sorted(set(active_fields)) if active_fields else "noValue"
     return result
 
-ActiveMap = Dict[int, Union[List[int], str]]
+def _attrs_on(attrs) -> bool:
+    """Lean check for one tag: an 'ON'/'ON-*' class token or an 'ON-n' marker in any attribute value."""
+    for name, value in attrs:
+        if not value:
+            continue
+        if name == "class":
+            if any(c.startswith("ON-") or c == "ON" for c in value.split()):
+                return True
+        elif _ON_PATTERN.search(value):
+            return True
+    return False
+
+class _TableScanner(HTMLParser):
+    """
+    Event-driven twin of `_parse_tables`: tracks transcript / table / row / cell
+    / first-svg nesting with counters and records one result per harp table.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.result: ActiveMap = {}
+        self._transcript = 0      # open <div>s since id="transcript" (0 = outside)
+        self._table = 0           # open <table>s inside the current harp table
+        self._silent = False
+        self._fields: List[int] = []
+        self._y = self._x = 0
+        self._cell: Optional[int] = None   # field number of the open cell
+        self._cell_on = False
+        self._svg = 0             # open <svg>s inside the cell's first svg
+        self._svg_done = False
+
+    def _close_cell(self) -> None:
+        if self._cell is not None and self._cell_on:
+            self._fields.append(self._cell)
+        self._cell, self._cell_on, self._svg, self._svg_done = None, False, 0, False
+
+    def handle_starttag(self, tag, attrs):
+        if not self._transcript:
+            if any(n == "id" and v == "transcript" for n, v in attrs):
+                self._transcript = 1 if tag == "div" else -1
+            return
+        if tag == "div" and self._transcript > 0:
+            self._transcript += 1
+        if tag == "table":
+            if self._table:
+                self._table += 1
+            else:
+                classes = next((v.split() for n, v in attrs if n == "class" and v), [])
+                if "harp" in classes:
+                    self._table, self._silent = 1, "silent" in classes
+                    self._fields, self._y, self._x = [], 0, 0
+            return
+        if not self._table or self._silent:
+            return
+        if tag == "tr":
+            self._close_cell()
+            self._y, self._x = self._y + 1, 0
+        elif tag == "td":
+            self._close_cell()
+            self._x += 1
+            self._cell = (self._y - 1) * 5 + self._x
+        elif self._cell is None:
+            return
+        elif tag == "svg" and not self._svg_done and not self._svg:
+            self._svg = 1
+            for n, v in attrs:
+                if n == "class" and v:
+                    for c in v.split():
+                        if c.startswith("button-"):
+                            try:
+                                self._cell = int(c.split("-", 1)[1]) + 1  # HTML uses 0..14
+                                break
+                            except ValueError:
+                                pass
+            self._cell_on = self._cell_on or _attrs_on(attrs)
+        elif self._svg:
+            if tag == "svg":
+                self._svg += 1
+            self._cell_on = self._cell_on or _attrs_on(attrs)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in ("svg", "div", "table"):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if not self._transcript:
+            return
+        if tag == "div" and self._transcript > 0:
+            self._transcript -= 1
+            return
+        if tag == "svg" and self._svg:
+            self._svg -= 1
+            self._svg_done = not self._svg
+        elif tag == "td":
+            self._close_cell()
+        elif tag == "table" and self._table:
+            self._table -= 1
+            if not self._table:
+                self._close_cell()
+                t_idx = len(self.result) + 1
+                self.result[t_idx] = "noValue" if self._silent or not self._fields else sorted(set(self._fields))
+
+def _scan_tables(data: bytes) -> ActiveMap:
+    """Lean old-flavor parse: stream the bytes through `_TableScanner` in chunks."""
+    scanner = _TableScanner()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    step = 1 << 16
+    for i in range(0, len(data), step):
+        scanner.feed(decoder.decode(data[i:i + step]))
+    scanner.feed(decoder.decode(b"", final=True))
+    scanner.close()
+    return scanner.result
 
 def _parse_div_instr(root: Tag) -> ActiveMap:
     """
@@ -108,33 +241,91 @@ def _parse_div_instr(root: Tag) -> ActiveMap:
 
     return result
 
-def load_active_map(html_path: str) -> ActiveMap:
+@dataclass(frozen=True)
+class Flavor:
+    name: str
+    signature: Pattern[bytes]             # matched against the raw file bytes
+    parse: Callable[[Tag], ActiveMap]     # receives the <div id="transcript"> root
+    stream: Optional[Callable[[bytes], ActiveMap]] = None   # lean mode: raw bytes, no tree
+
+FLAVORS: List[Flavor] = []
+SNIFF_BYTES = 64 * 1024
+
+def register_flavor(name: str, signature: bytes, parse: Callable[[Tag], ActiveMap], first: bool = False,
+                    stream: Optional[Callable[[bytes], ActiveMap]] = None) -> Flavor:
+    """Add an HTML flavor. Earlier flavors win when several signatures match."""
+    flavor = Flavor(name, re.compile(signature, re.IGNORECASE), parse, stream)
+    if first:
+        FLAVORS.insert(0, flavor)
+    else:
+        FLAVORS.append(flavor)
+    return flavor
+
+def _class_attr(tag: bytes, *tokens: bytes) -> bytes:
+    """Regex for <tag ... class="..."> whose class list contains all tokens."""
+    need = b"".join(rb"(?=[^\"'>]*(?<![\w-])" + t + rb"(?![\w-]))" for t in tokens)
+    return rb"<" + tag + rb"\b[^>]*?\bclass\s*=\s*[\"']?" + need
+
+register_flavor("table.harp", _class_attr(b"table", b"harp"), _parse_tables, stream=_scan_tables)
+register_flavor("div.instr.harp", _class_attr(b"div", b"instr", b"harp"), _parse_div_instr)
+
+def sniff_flavors(data: bytes) -> List[Flavor]:
+    """
+    Flavors whose signature matches. The first SNIFF_BYTES decide in the common
+    case; pages with a long <head> fall back to a byte scan of the rest, which
+    is still far cheaper than building a tree.
+    """
+    head = data[:SNIFF_BYTES]
+    found = [f for f in FLAVORS if f.signature.search(head)]
+    if not found and len(data) > SNIFF_BYTES:
+        found = [f for f in FLAVORS if f.signature.search(data)]
+    return found
+
+def load_active_map(html_path: str, lean: bool = False) -> ActiveMap:
     """
     Parse the HTML and return { bar_index: [active_field_numbers] }.
     If a bar has no active cells, set value to 'noValue'.
 
-    Supports:
+    Supports every registered flavor, by default:
       - Old flavor: <table class='harp'> with <svg class='ON-*'>...
       - New flavor: <div class='instr harp'> with 15 child tags (d1/d2/d3/crc/crdm).
+
+    With lean=True, flavors that have a streaming scanner are tried first
+    without building a tree.
     """
     p = Path(html_path)
     if not p.exists():
         raise FileNotFoundError(f"HTML file not found: {p}")
 
-    soup = BeautifulSoup(p.read_text(encoding="utf-8", errors="ignore"), "html.parser")
-    root = soup.find(id="transcript")
-    if not root:
-        raise RuntimeError('Could not find <div id="transcript"> in the HTML.')
+    data = p.read_bytes()
+    candidates = sniff_flavors(data)
+    if not candidates:
+        known = ", ".join(f.name for f in FLAVORS)
+        raise RuntimeError(f"No recognizable harp structures found (expected one of: {known}).")
 
-    # Try old flavor first
-    tables = root.select("table.harp")
-    if tables:
-        return _parse_tables(root)
+    if lean:
+        for flavor in candidates:
+            if flavor.stream is not None:
+                result = flavor.stream(data)
+                if result:
+                    return result
 
-    # Fallback to new flavor
-    bars = root.select("div.instr.harp")
-    if bars:
-        return _parse_div_instr(root)
+    big = len(data) >= _GC_AFTER_BYTES
+    soup = BeautifulSoup(data.decode("utf-8", errors="ignore"), "html.parser")
+    del data
+    root = soup.find(id="transcript")
+    has_root = root is not None
+    # A signature can match markup outside the transcript; try the next candidate on the same tree.
+    result = next((r for r in (f.parse(root) for f in candidates) if r), None) if has_root else None
+    # The tree is one big reference cycle. For large inputs, free it now rather than at
+    # some later GC pass; for small ones a full collection would cost more than it frees.
+    del root, soup
+    if big:
+        gc.collect()
 
-    # If neither is present, give a helpful error
-    raise RuntimeError("No recognizable harp structures found (expected table.harp or div.instr.harp).")
+    if not has_root:
+        raise RuntimeError('Could not find <div id="transcript"> in the HTML.')
+    if result:
+        return result
+    known = ", ".join(f.name for f in candidates)
+    raise RuntimeError(f"No recognizable harp structures found inside the transcript (matched: {known}).")
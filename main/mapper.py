@@ -6,11 +6,14 @@ Normalizes loaded active maps:
 - keeps only integers 1..15
 - sorts and de-duplicates
 - converts empty bars to "noValue"
+
+Also provides the compact chord encoding used by the song library: one
+15-bit mask per bar (bit n-1 set when field n is active, 0 for a rest).
 """
 
 
 from __future__ import annotations
-from typing import Dict, List, Union
+from typing import Dict, Iterable, List, Union
 
 ActiveMapIn  = Dict[int, Union[List[int], str]]
 ActiveMapOut = Dict[int, Union[List[int], str]]
@@ -28,3 +31,26 @@ def map_active_map(active_map: ActiveMapIn, profile: str = "") -> ActiveMapOut:
         clean = sorted({n for n in value if isinstance(n, int) and 1 <= n <= 15})
         mapped[idx] = clean if clean else "noValue"
     return mapped
+
+def chord_mask(value: Union[List[int], str]) -> int:
+    """Encode one bar as a bitmask (0 == rest)."""
+    if value == "noValue":
+        return 0
+    mask = 0
+    for n in value:
+        if isinstance(n, int) and 1 <= n <= 15:
+            mask |= 1 << (n - 1)
+    return mask
+
+def mask_fields(mask: int) -> Union[List[int], str]:
+    """Decode a bitmask back into sorted field numbers (or "noValue")."""
+    fields = [n for n in range(1, 16) if mask >> (n - 1) & 1]
+    return fields if fields else "noValue"
+
+def encode_bars(mapping: ActiveMapOut) -> List[int]:
+    """Mapped bars (in bar order) -> list of chord bitmasks."""
+    return [chord_mask(mapping[idx]) for idx in sorted(mapping.keys())]
+
+def decode_bars(masks: Iterable[int]) -> ActiveMapOut:
+    """Chord bitmasks -> mapped bars numbered from 1."""
+    return {idx: mask_fields(m) for idx, m in enumerate(masks, start=1)}
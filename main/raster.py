@@ -0,0 +1,189 @@
+#main/raster.py
+"""
+Raster exporter
+===============
+Renders the mapped bars straight into PNG pages, laid out like the
+`.card`/`.stack` grid of `export_html_stack`, without a browser.
+
+- Icons are decoded once into an atlas of 80x80 tiles pre-composited onto
+  the icon background, so placing an icon is a plain opaque paste.
+- The layout is computed up front and split into pages of bounded height;
+  each page is rendered and saved on its own, so memory stays at one page
+  per worker no matter how long the song is.
+- Pages are rendered in parallel across processes (the atlas is shipped to
+  each worker once, via the pool initializer).
+
+Requires Pillow (listed in requirements.txt); without it rendering raises RuntimeError.
+
+Exports:
+- render_png_pages(mapping, out_png, title, profile, ...) -> List[Path]
+- export_png_pages(mapping, out_png, title, profile) -> Path   (Exporter protocol; first page)
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import io, logging, os
+
+from profiles import get_profile, compile_profile, ICON_SIZE
+
+# Pillow (in requirements.txt; imported leniently so the HTML exporters work without it)
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except Exception:
+    Image = ImageDraw = ImageFont = None
+
+ActiveMapOut = Dict[int, Union[List[int], str]]
+
+# geometry mirrors EXPORT_CSS
+BODY_PAD = 18
+GAP = 12
+CARD_W = 120
+CARD_PAD = 6
+TITLE_H = 19          # 13px title + 6px margin
+STACK_GAP = 6
+STACK_PAD = 2
+REST_H = 32
+HEADER_H = 44
+PAGE_WIDTH = 1600
+PAGE_MAX_HEIGHT = 4000
+
+BG = (0x1e, 0x24, 0x2b); CARD_BORDER = (0x1b, 0x1e, 0x22); ICON_BG = (0x0f, 0x11, 0x13)
+TITLE_FG = (0x98, 0xf5, 0xc4); TEXT_FG = (0xdf, 0xe3, 0xe6); MUTED = (0x8b, 0x92, 0x9a)
+
+Card = Tuple[int, int, int, int, Union[List[int], str]]   # x, y, height, bar index, value
+
+def _card_h(val) -> int:
+    body = REST_H if val == "noValue" else len(val) * (ICON_SIZE + STACK_GAP) - STACK_GAP + 2 * STACK_PAD
+    return 2 * CARD_PAD + TITLE_H + body
+
+def _layout(mapping: ActiveMapOut, width: int, max_height: int) -> List[Tuple[int, List[Card]]]:
+    """Split bars into pages of whole rows: [(page_height, cards)]."""
+    cols = max(1, (width - 2 * BODY_PAD + GAP) // (CARD_W + GAP))
+    keys = sorted(mapping)
+    pages: List[Tuple[int, List[Card]]] = []
+    cards: List[Card] = []
+    y = BODY_PAD + HEADER_H
+    for r in range(0, len(keys), cols):
+        row = keys[r:r + cols]
+        row_h = max(_card_h(mapping[k]) for k in row)
+        if cards and y + row_h + BODY_PAD > max_height:
+            pages.append((y - GAP + BODY_PAD, cards))
+            cards, y = [], BODY_PAD + HEADER_H
+        for c, k in enumerate(row):
+            cards.append((BODY_PAD + c * (CARD_W + GAP), y, row_h, k, mapping[k]))  # flex rows stretch cards
+        y += row_h + GAP
+    if cards or not pages:
+        pages.append((max(y - GAP + BODY_PAD, BODY_PAD + HEADER_H), cards))
+    return pages
+
+def _font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1: fixed-size bitmap font
+        return ImageFont.load_default()
+
+def _build_atlas(prof) -> Tuple[bytes, Dict[int, int]]:
+    """Decode each icon once into a strip of ICON_SIZE tiles; returns (RGB bytes, {number: tile})."""
+    compiled = compile_profile(prof)
+    tiles: List["Image.Image"] = []
+    slots: Dict[int, int] = {}
+    for num in range(1, 16):
+        p = compiled.get(num)
+        try:
+            data = p.read_bytes() if p else prof.icon_bytes(num)
+            if data is None:
+                continue
+            with Image.open(io.BytesIO(bytes(data))) as img:
+                icon = img.convert("RGBA")
+        except Exception as e:
+            logging.info("Raster: icon %d of '%s' unusable: %s", num, prof.key, e)
+            continue
+        icon.thumbnail((ICON_SIZE, ICON_SIZE), Image.LANCZOS)
+        tile = Image.new("RGBA", (ICON_SIZE, ICON_SIZE), ICON_BG + (255,))
+        tile.alpha_composite(icon, ((ICON_SIZE - icon.width) // 2, (ICON_SIZE - icon.height) // 2))
+        slots[num] = len(tiles)
+        tiles.append(tile.convert("RGB"))
+    atlas = Image.new("RGB", (ICON_SIZE * max(1, len(tiles)), ICON_SIZE), ICON_BG)
+    for i, t in enumerate(tiles):
+        atlas.paste(t, (i * ICON_SIZE, 0))
+    return atlas.tobytes(), slots
+
+# ------- worker side (state set once per process by _init_worker)
+_W: dict = {}
+
+def _init_worker(atlas: bytes, slots: Dict[int, int], labels: Dict[int, str], rest_label: str, text_fallback: bool) -> None:
+    strip = Image.frombytes("RGB", (ICON_SIZE * max(1, len(slots)), ICON_SIZE), atlas)
+    _W["tiles"] = {n: strip.crop((i * ICON_SIZE, 0, (i + 1) * ICON_SIZE, ICON_SIZE)) for n, i in slots.items()}
+    _W["labels"], _W["rest"], _W["fallback"] = labels, rest_label, text_fallback
+    _W["fonts"] = {s: _font(s) for s in (13, 22, 12, 20)}
+
+def _render_page(out: str, width: int, height: int, heading: str, cards: List[Card]) -> str:
+    tiles, fonts = _W["tiles"], _W["fonts"]
+    page = Image.new("RGB", (width, height), BG)
+    draw = ImageDraw.Draw(page)
+    draw.text((BODY_PAD, BODY_PAD), heading, fill=TEXT_FG, font=fonts[20])
+    for x, y, h, idx, val in cards:
+        draw.rounded_rectangle((x, y, x + CARD_W - 1, y + h - 1), radius=12, outline=CARD_BORDER)
+        draw.text((x + CARD_PAD, y + CARD_PAD), f"Bar {idx}", fill=TITLE_FG, font=fonts[13])
+        top = y + CARD_PAD + TITLE_H
+        if val == "noValue":
+            draw.rounded_rectangle((x + CARD_PAD, top, x + CARD_W - CARD_PAD, top + REST_H), radius=8, outline=CARD_BORDER)
+            draw.text((x + CARD_W // 2, top + REST_H // 2), _W["rest"], fill=MUTED, font=fonts[12], anchor="mm")
+            continue
+        top += STACK_PAD
+        for num in val:
+            tile = tiles.get(num)
+            if tile is not None:
+                page.paste(tile, (x + CARD_PAD, top))
+            else:
+                draw.rounded_rectangle((x + CARD_PAD, top, x + CARD_PAD + ICON_SIZE, top + ICON_SIZE),
+                                       radius=6, fill=ICON_BG, outline=CARD_BORDER)
+                if _W["fallback"]:
+                    draw.text((x + CARD_PAD + ICON_SIZE // 2, top + ICON_SIZE // 2), _W["labels"].get(num, str(num)),
+                              fill=TEXT_FG, font=fonts[22], anchor="mm")
+            top += ICON_SIZE + STACK_GAP
+    page.save(out, "PNG", compress_level=3)
+    return out
+
+def render_png_pages(mapping: ActiveMapOut,
+                     out_png: str | Path,
+                     title: str = "Harp Export",
+                     profile: str = "",
+                     page_width: int = PAGE_WIDTH,
+                     max_page_height: int = PAGE_MAX_HEIGHT,
+                     workers: Optional[int] = None) -> List[Path]:
+    """Write `<stem>-01.png`, `<stem>-02.png`, ... next to out_png and return their paths."""
+    if Image is None:
+        raise RuntimeError("PNG export needs Pillow: pip install -r requirements.txt")
+    prof = get_profile(profile)
+    out_png = Path(out_png)
+    out_png.parent.mkdir(parents=True, exist_ok=True)
+
+    pages = _layout(mapping, page_width, max_page_height)
+    outs = [out_png.with_name(f"{out_png.stem}-{i:02d}.png") for i in range(1, len(pages) + 1)]
+    jobs = [
+        (str(o), page_width, h, f"{title} · {prof.label} · page {i}/{len(pages)}", cards)
+        for i, (o, (h, cards)) in enumerate(zip(outs, pages), start=1)
+    ]
+    atlas, slots = _build_atlas(prof)
+    init = (atlas, slots, {n: prof.display_name_for(n) for n in range(1, 16)}, prof.rest_label, prof.text_fallback)
+    logging.info("Rendering %d PNG page(s) (%s) with profile '%s'", len(pages), out_png, prof.key)
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        _init_worker(*init)
+        for job in jobs:
+            _render_page(*job)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init) as ex:
+            list(ex.map(_render_page, *zip(*jobs)))
+    return outs
+
+def export_png_pages(mapping: ActiveMapOut, out_png: str | Path = None,
+                     title: str = "Harp Export", profile: str = "") -> Path:
+    """Exporter-protocol wrapper: renders all pages, returns the first one."""
+    if out_png is None:
+        out_png = Path(__file__).resolve().parents[1] / "export" / "export.png"
+    return render_png_pages(mapping, out_png, title=title, profile=profile)[0]
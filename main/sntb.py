@@ -0,0 +1,134 @@
+#main/sntb.py
+"""
+Binary song format (.sntb)
+==========================
+Compact container for a converted song: two bytes per bar.
+
+Layout (little-endian):
+- header   "<4sHHIHI2x": magic b"SNTB", version, flags, bar_count,
+           title length, metadata length
+- title    UTF-8
+- metadata UTF-8 JSON object (optional, length 0 when absent)
+- padding  to an even offset
+- bars     bar_count x uint16 chord bitmask (bit n-1 == field n, 0 == rest)
+
+The reader memory-maps the file and exposes the bar array without copying.
+`export_sntb` / `load_sntb` fit the Exporter / Loader protocols, so
+`ConversionService(load_active_map, map_active_map, export_sntb)` converts
+HTML to .sntb and `ConversionService(load_sntb, map_active_map, export_html_stack)`
+re-renders a stored song with any profile.
+
+Exports:
+- SNTB_SUFFIX, SNTB_VERSION
+- write_sntb(path, masks, title="", meta=None) -> Path
+- SntbSong(path): .title, .meta, .bars (uint16 memoryview), to_active_map(), close()
+- export_sntb(mapping, out_path, title, profile) -> Path
+- load_sntb(path) -> ActiveMap
+"""
+
+from __future__ import annotations
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+import json, mmap, struct, sys
+
+from .mapper import encode_bars, decode_bars
+
+ActiveMap = Dict[int, Union[List[int], str]]
+
+SNTB_SUFFIX = ".sntb"
+SNTB_VERSION = 1
+_MAGIC = b"SNTB"
+_HEADER = struct.Struct("<4sHHIHI2x")
+
+def write_sntb(path: str | Path, masks: Sequence[int], title: str = "", meta: Optional[dict] = None) -> Path:
+    """Write bar bitmasks (and optional title/metadata) to a .sntb file."""
+    path = Path(path)
+    title_b = title.encode("utf-8")
+    meta_b = json.dumps(meta, separators=(",", ":")).encode("utf-8") if meta else b""
+    if len(title_b) > 0xFFFF:
+        raise ValueError("Title too long for .sntb header.")
+    bars = array("H", masks)
+    if sys.byteorder == "big":
+        bars.byteswap()
+    head = _HEADER.pack(_MAGIC, SNTB_VERSION, 0, len(bars), len(title_b), len(meta_b)) + title_b + meta_b
+    if len(head) % 2:
+        head += b"\0"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(head)
+        f.write(bars.tobytes())
+    return path
+
+class SntbSong:
+    """Memory-mapped .sntb file. Keep it open while using `bars`."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Song file not found: {self.path}")
+        with open(self.path, "rb") as f:
+            size = self.path.stat().st_size
+            if size < _HEADER.size:
+                raise RuntimeError(f"Not a .sntb file (too short): {self.path}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _parse(self) -> None:
+        magic, version, _flags, count, title_len, meta_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise RuntimeError(f"Not a .sntb file (bad magic): {self.path}")
+        if version > SNTB_VERSION:
+            raise RuntimeError(f".sntb version {version} is newer than supported ({SNTB_VERSION}).")
+        pos = _HEADER.size
+        if pos + title_len + meta_len > len(self._mm):
+            raise RuntimeError(f"Truncated .sntb file: {self.path}")
+        self.title = bytes(self._mm[pos:pos + title_len]).decode("utf-8", errors="replace")
+        pos += title_len
+        try:
+            self.meta: dict = json.loads(self._mm[pos:pos + meta_len]) if meta_len else {}
+        except ValueError as e:  # JSONDecodeError / UnicodeDecodeError
+            raise RuntimeError(f"Not a .sntb file (bad metadata): {self.path}") from e
+        if not isinstance(self.meta, dict):
+            raise RuntimeError(f"Not a .sntb file (bad metadata): {self.path}")
+        pos += meta_len + (pos + meta_len) % 2
+        if pos + 2 * count > len(self._mm):
+            raise RuntimeError(f"Truncated .sntb file: {self.path}")
+
+        self._view = memoryview(self._mm)[pos:pos + 2 * count]
+        if sys.byteorder == "little":
+            self.bars = self._view.cast("H")
+        else:
+            swapped = array("H", self._view.tobytes())
+            swapped.byteswap()
+            self.bars = memoryview(swapped)
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def to_active_map(self) -> ActiveMap:
+        return decode_bars(self.bars)
+
+    def close(self) -> None:
+        self.bars.release()
+        self._view.release()
+        self._mm.close()
+
+    def __enter__(self) -> "SntbSong":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def export_sntb(mapping: ActiveMap, out_path: str | Path, title: str = "", profile: str = "") -> Path:
+    """Exporter-compatible writer. ('profile' is ignored: bars are profile-independent.)"""
+    return write_sntb(out_path, encode_bars(mapping), title=title)
+
+def load_sntb(path: str) -> ActiveMap:
+    """Loader-compatible reader: { bar_index: [fields] | "noValue" }."""
+    with SntbSong(path) as song:
+        return song.to_active_map()
@@ -0,0 +1,92 @@
+#main/songbook.py
+"""
+Songbook exporter
+=================
+Writes many mapped songs into a single HTML document: a table of contents,
+one anchored section per song, and one shared icon table for the profile.
+
+Icons are read and base64-encoded once per songbook and emitted as CSS
+classes (`.i1` .. `.i15`), so each bar only references a class instead of
+embedding its own copy. Songs are passed as (title, load) pairs; each `load()`
+runs only when its section is written and the result is dropped right after,
+so memory stays at one song regardless of setlist length. Sections use
+`content-visibility:auto` so browsers render them lazily as well.
+
+Exports:
+- export_songbook(songs, out_html, title, profile) -> Path
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+import html, logging
+
+from profiles import get_profile, compile_profile
+from .exporter import EXPORT_CSS, bar_card_html, icon_fallback_html, _icon_src
+
+ActiveMapOut = Dict[int, Union[List[int], str]]
+
+_SONGBOOK_CSS = """
+    .toc { columns:2 280px; margin:0 0 18px; padding-left:22px; }
+    .toc a { color:#9fb3c8; text-decoration:none; }
+    .toc a:hover { text-decoration:underline; }
+    section.song { content-visibility:auto; contain-intrinsic-size:auto 1200px; margin:0 0 28px; }
+    section.song h2 { font-size:18px; margin:0 0 10px; }
+    section.song h2 a { color:#8b929a; font-size:12px; font-weight:400; margin-left:8px; text-decoration:none; }
+    .error { color:#f46666; font-size:13px; }
+    span.icon { display:block; background-position:center; background-size:contain; background-repeat:no-repeat; }
+    """
+
+def export_songbook(songs: Iterable[Tuple[str, Callable[[], ActiveMapOut]]],
+                    out_html: str | Path,
+                    title: str = "Songbook",
+                    profile: str = "") -> Path:
+    """Stream the songbook to out_html and return its path."""
+    entries = list(songs)  # titles + loaders only; bars are loaded per section
+    prof = get_profile(profile)
+    out_html = Path(out_html)
+    out_dir = out_html.parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+    logging.info("Generating songbook (%s, %d songs) with profile '%s'", out_html, len(entries), prof.key)
+
+    compiled = compile_profile(prof)
+    icon_css: List[str] = []
+    icons: Dict[int, str] = {}
+    for num in range(1, 16):
+        label = html.escape(prof.display_name_for(num), quote=True)
+        src = _icon_src(num, out_dir, prof, compiled=compiled)
+        if src:
+            icon_css.append(f".i{num}{{background-image:url({src})}}")
+            icons[num] = f"<span class='icon i{num}' role='img' aria-label='{label}' title='{label}'></span>"
+        else:
+            icons[num] = icon_fallback_html(prof, label)
+
+    esc_title = html.escape(title)
+    with open(out_html, "w", encoding="utf-8") as f:
+        f.write("<!doctype html><html><head><meta charset='utf-8'>")
+        f.write(f"<title>{esc_title}</title><style>{EXPORT_CSS}{_SONGBOOK_CSS}{''.join(icon_css)}</style></head><body>")
+        f.write(f"<h1 id='top'>{esc_title}</h1>")
+        f.write(f"<div class='sub'>Profile: {prof.label} · {len(entries)} songs</div>")
+
+        f.write("<ol class='toc'>")
+        for i, (song_title, _) in enumerate(entries, start=1):
+            f.write(f"<li><a href='#song-{i}'>{html.escape(song_title)}</a></li>")
+        f.write("</ol>")
+
+        for i, (song_title, load) in enumerate(entries, start=1):
+            f.write(f"<section class='song' id='song-{i}'>")
+            f.write(f"<h2>{i}. {html.escape(song_title)}<a href='#top'>↑ contents</a></h2>")
+            try:
+                mapping = load()
+            except Exception as e:
+                logging.info("Songbook entry '%s' failed: %s", song_title, e)
+                f.write(f"<div class='error'>Could not load this song: {html.escape(str(e))}</div></section>")
+                continue
+            f.write("<div class='wrap'>")
+            for t_idx in sorted(mapping.keys()):
+                f.write(bar_card_html(t_idx, mapping[t_idx], prof, icons.__getitem__))
+            f.write("</div></section>")
+            del mapping
+
+        f.write("<footer>Generated by songbook.py</footer></body></html>")
+    return out_html
@@ -0,0 +1,77 @@
+#maintenance/bench_loader_memory.py
+"""
+Loader memory benchmark
+=======================
+Writes a synthetic old-flavor transcript (<table class='harp'> with one
+<svg> per cell) and measures peak traced memory, memory still held after
+return, and wall time of `load_active_map` in tree and lean mode. Also checks
+that both modes return the same bars.
+
+Usage (from the repo root):
+    python maintenance/bench_loader_memory.py [--bars 1000] [--svg-paths 4]
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import argparse, gc, random, sys, tempfile, time, tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from main.loader import load_active_map
+
+def write_old_flavor(path: Path, bars: int, svg_paths: int, seed: int = 1) -> Path:
+    """Old Sky HTML with `svg_paths` decorative <path>s per cell (real exports carry several)."""
+    rnd = random.Random(seed)
+    deco = "".join(f"<path d='M{i} 0 C {i} 4, 8 {i}, 10 10' fill='none'/>" for i in range(svg_paths))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<html><head><title>bench</title></head><body><div id='transcript'>")
+        for _ in range(bars):
+            if rnd.random() < 0.15:
+                f.write("<table class='harp silent'><tr><td></td></tr></table>")
+                continue
+            on = set(rnd.sample(range(15), rnd.randint(1, 3)))
+            f.write("<table class='harp'>")
+            for y in range(3):
+                f.write("<tr>")
+                for x in range(5):
+                    i = y * 5 + x
+                    state = "ON-0" if i in on else "OFF"
+                    f.write(f"<td><svg class='button-{i}' viewBox='0 0 10 10'><g><circle class='{state}' r='4'/>"
+                            f"{deco}</g></svg></td>")
+                f.write("</tr>")
+            f.write("</table>")
+        f.write("</div></body></html>")
+    return path
+
+def measure(path: Path, lean: bool):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = load_active_map(str(path), lean=lean)
+    elapsed = time.perf_counter() - t0
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, held, elapsed
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--bars", type=int, default=1000)
+    ap.add_argument("--svg-paths", type=int, default=4)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_old_flavor(Path(tmp) / "old_flavor.html", args.bars, args.svg_paths)
+        size = path.stat().st_size
+        print(f"input: {args.bars} bars, {size / 1024:.0f} KiB (timings include tracemalloc overhead)")
+        results = {}
+        for lean in (False, True):
+            result, peak, held, elapsed = measure(path, lean)
+            results[lean] = result
+            print(f"{'lean' if lean else 'tree':>5}: peak {peak / 1024:8.0f} KiB ({peak / size:5.1f}x input)"
+                  f"  held {held / 1024:6.0f} KiB  {elapsed:6.2f} s")
+    if results[False] != results[True]:
+        print("MISMATCH: lean and tree mode disagree", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,7 @@ $AssetsDir   = Join-Path $ProjectRoot 'assets'
 $UiDir       = Join-Path $ProjectRoot 'sntb-ui'
 $DocsDir     = Join-Path $ProjectRoot 'docs'
 $IconPath    = Join-Path $AssetsDir 'scotl_minimalist.ico'
+$ArchivePath = Join-Path $ProjectRoot 'sntb-assets.zip'
 $Entry       = Join-Path $ProjectRoot 'main\__main__.py'
 $ExeName     = 'SkyNotesToButtons.exe'
 
@@ -47,19 +48,23 @@ foreach ($p in @($AssetsDir, $UiDir, $DocsDir)) {
   if (-not (Test-Path $p)) { throw "Required data directory missing: $p" }
 }
 
+# --- Pack sntb-ui + docs into one indexed archive (loose folders next to the EXE still override it)
+& $VenvPy -m services.archive pack --out $ArchivePath
+if ($LASTEXITCODE -ne 0) { throw "Packing assets failed with exit code $LASTEXITCODE" }
+
 # --- Flags
 $Flags = @(
   '--standalone',
   '--enable-plugin=tk-inter',
   '--include-package=bs4',
   '--include-package=ttkbootstrap',
+  '--include-package=PIL',
   '--include-package=services',
   '--include-package=profiles',
   '--include-package=ui',
   '--include-package=docs',
   "--include-data-dir=$AssetsDir=assets",
-  "--include-data-dir=$UiDir=sntb-ui",
-  "--include-data-dir=$DocsDir=docs",
+  "--include-data-file=$ArchivePath=sntb-assets.zip",
   "--windows-icon-from-ico=$IconPath",
   '--windows-company-name=al2d-x',
   "--windows-product-name=Sky: Notes → Buttons",
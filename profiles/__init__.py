@@ -8,7 +8,9 @@ Public re-exports for profile discovery/validation and registry access.
 Re-exports:
 - Profile, ProfileReport
 - ASSETS_DIR, PROFILES, get_profile, get_profile_report, refresh_profiles
+- ICON_SIZE, compile_profile
 """
 
 from .model import Profile, ProfileReport
 from .registry import ASSETS_DIR, PROFILES, get_profile, get_profile_report, refresh_profiles
+from .icons import ICON_SIZE, compile_profile
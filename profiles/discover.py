@@ -3,11 +3,13 @@
 Profiles: discovery
 ===================
 Finds the icon assets root and enumerates profile directories. Reads optional
-`profile.json` per profile to fill label and display names.
+`profile.json` per profile to fill label and display names. Profiles packed
+into the asset archive are enumerated the same way.
 
 Exports:
 - resolve_assets_root() -> Path
 - discover_profiles(root: Path) -> Dict[str, Profile]
+- discover_archive_profiles(archive, root: Path) -> Dict[str, Profile]
 """
 
 from __future__ import annotations
@@ -15,6 +17,8 @@ from pathlib import Path
 from typing import Dict, Tuple
 import json, sys
 
+from services.archive import AssetArchive, PROFILES_PREFIX
+
 from .model import Profile
 
 def _candidate_roots() -> list[Path]:
@@ -37,16 +41,17 @@ def resolve_assets_root() -> Path:
     for c in _candidate_roots():
         if c.is_dir():
             return c.resolve()
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).resolve().parent / "sntb-ui"  # where users add loose profiles
     return Path("sntb-ui").resolve()
 
-def _load_profile_meta(dir_path: Path) -> Tuple[str, dict[int, str], str]:
-    label = dir_path.name
+def _parse_profile_meta(default_label: str, raw: bytes | None) -> Tuple[str, dict[int, str], str]:
+    label = default_label
     names: dict[int, str] = {}
     rest_label = "Rest"
-    meta = dir_path / "profile.json"
-    if meta.exists():
+    if raw is not None:
         try:
-            data = json.loads(meta.read_text(encoding="utf-8"))
+            data = json.loads(bytes(raw).decode("utf-8"))
             if isinstance(data, dict):
                 label = data.get("label", label)
                 rest_label = data.get("rest_label", rest_label)
@@ -62,6 +67,14 @@ def _load_profile_meta(dir_path: Path) -> Tuple[str, dict[int, str], str]:
             pass
     return label, names, rest_label
 
+def _load_profile_meta(dir_path: Path) -> Tuple[str, dict[int, str], str]:
+    meta = dir_path / "profile.json"
+    try:
+        raw = meta.read_bytes() if meta.exists() else None
+    except OSError:
+        raw = None
+    return _parse_profile_meta(dir_path.name, raw)
+
 def _dir_looks_like_profile(p: Path) -> bool:
     if not p.is_dir() or p.name.startswith("."):
         return False
@@ -84,3 +97,20 @@ def discover_profiles(root: Path) -> Dict[str, Profile]:
                 key=key, label=label, asset_dir=child.resolve(), names=names, rest_label=rest_label, text_fallback=True
             )
     return profiles
+
+def discover_archive_profiles(archive: AssetArchive, root: Path) -> Dict[str, Profile]:
+    """Profiles stored under `sntb-ui/` in the archive; `root / key` is their nominal folder."""
+    profiles: Dict[str, Profile] = {}
+    for key in archive.listdir(PROFILES_PREFIX):
+        prefix = f"{PROFILES_PREFIX}/{key}"
+        files = archive.listdir(prefix)
+        if key.startswith(".") or not files:
+            continue
+        if "profile.json" not in files and not any(f.lower().endswith(".png") for f in files):
+            continue
+        label, names, rest_label = _parse_profile_meta(key, archive.read(f"{prefix}/profile.json"))
+        profiles[key] = Profile(
+            key=key, label=label, asset_dir=root / key, names=names, rest_label=rest_label,
+            text_fallback=True, archive=archive,
+        )
+    return profiles
@@ -0,0 +1,178 @@
+#profiles/icons.py
+"""
+Profiles: icon compilation
+==========================
+"Compiles" a profile's 1..15 icons into display-sized, optimized PNG
+derivatives so exports don't inline whatever the icon pack was authored with.
+
+Derivatives live in a cache directory next to the profiles (`.cache/icons`,
+ignored by discovery because it starts with a dot) and are named after the
+source hash and the target size. A small index remembers each source's
+size/mtime so unchanged icons are neither re-hashed nor re-processed.
+The chosen cache directory and its index are kept in memory for the life of
+the process, so repeated exports only stat the source icons.
+
+Icons inside the asset archive are compiled once, by `services.archive pack`,
+so archived profiles need no cache at all: exports inline the archive bytes.
+
+Pillow (in requirements.txt and the frozen build) downscales oversized
+icons; if it is missing, icons are only recompressed losslessly.
+
+Exports:
+- ICON_SIZE
+- compile_profile(profile, size=ICON_SIZE, cache_dir=None) -> Dict[int, Path]
+- derive_icon(data, size=ICON_SIZE) -> bytes
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Callable, Dict, Optional
+import hashlib, io, json, logging, os, tempfile, threading
+
+from .model import Profile
+from .png import recompress_png
+
+# Pillow (optional)
+try:
+    from PIL import Image
+except Exception:
+    Image = None
+
+ICON_SIZE = 80  # matches `.icon { width:80px; height:80px }` in the exporter CSS
+_INDEX_NAME = "index.json"
+
+_LOCK = threading.Lock()                          # guards the two memos below
+_CACHE_DIRS: Dict[Path, Optional[Path]] = {}      # preferred dir -> writable dir (or None)
+_INDEXES: Dict[Path, dict] = {}                   # cache dir -> loaded index.json
+
+def _tmp_tag() -> str:
+    """Unique per process *and* thread, so concurrent exports never share a temp file."""
+    return f"{os.getpid()}-{threading.get_ident()}"
+
+def _default_cache_dir(profile: Profile) -> Path:
+    return profile.asset_dir.parent / ".cache" / "icons"
+
+def _writable_cache_dir(preferred: Path) -> Optional[Path]:
+    """Probe once per process; later calls reuse the answer."""
+    with _LOCK:
+        if preferred in _CACHE_DIRS:
+            return _CACHE_DIRS[preferred]
+    found = _probe_cache_dir(preferred)
+    with _LOCK:
+        _CACHE_DIRS[preferred] = found
+    return found
+
+def _forget_cache_dir(preferred: Path) -> None:
+    """Re-probe next time (the directory was removed or became read-only)."""
+    with _LOCK:
+        cache = _CACHE_DIRS.pop(preferred, None)
+        if cache is not None:
+            _INDEXES.pop(cache, None)
+
+def _probe_cache_dir(preferred: Path) -> Optional[Path]:
+    for c in (preferred, Path(tempfile.gettempdir()) / "sntb-icons"):
+        try:
+            c.mkdir(parents=True, exist_ok=True)
+            probe = c / ".probe"
+            probe.write_bytes(b"")
+            probe.unlink()
+            return c
+        except OSError:
+            continue
+    return None
+
+def _load_index(cache: Path) -> dict:
+    """The in-memory index for this cache dir, read from disk on first use. Hold _LOCK when touching it."""
+    with _LOCK:
+        if cache in _INDEXES:
+            return _INDEXES[cache]
+    try:
+        data = json.loads((cache / _INDEX_NAME).read_text(encoding="utf-8"))
+        data = data if isinstance(data, dict) else {}
+    except Exception:
+        data = {}
+    with _LOCK:
+        return _INDEXES.setdefault(cache, data)
+
+def _save_index(cache: Path, index: dict) -> None:
+    tmp = cache / f"{_INDEX_NAME}.{_tmp_tag()}.tmp"
+    try:
+        with _LOCK:
+            text = json.dumps(index, indent=1, sort_keys=True)
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, cache / _INDEX_NAME)
+    except OSError as e:
+        logging.info("Icon cache index not saved: %s", e)
+
+def derive_icon(data: bytes, size: int = ICON_SIZE) -> bytes:
+    """Downscale oversized icons; otherwise keep the smaller of original and lossless recompression."""
+    best = data
+    try:
+        best = recompress_png(data)
+    except Exception:
+        pass
+    if Image is not None:
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                if max(img.size) > size:
+                    small = img.convert("RGBA")
+                    small.thumbnail((size, size), Image.LANCZOS)
+                    buf = io.BytesIO()
+                    small.save(buf, "PNG", optimize=True)
+                    # Downscaled output always wins over an oversized source,
+                    # even if a tiny palette PNG would compress better.
+                    best = buf.getvalue()
+        except Exception as e:
+            logging.info("Pillow could not resize icon: %s", e)
+    return best
+
+def _materialize(cache: Path, digest: str, size: int, load: Callable[[], bytes]) -> Path:
+    dst = cache / f"{digest[:24]}_{size}.png"
+    if not dst.exists():
+        derived = derive_icon(load(), size)
+        tmp = dst.with_suffix(f".{_tmp_tag()}.tmp")
+        tmp.write_bytes(derived)
+        os.replace(tmp, dst)
+    return dst
+
+def compile_profile(profile: Profile, size: int = ICON_SIZE, cache_dir: Path | None = None) -> Dict[int, Path]:
+    """
+    Ensure derivatives exist for the profile's loose icons and return {number: path}.
+    Missing icons are omitted; if no cache is writable, loose sources are returned.
+    Archived icons are never in the result: they were compiled when the archive
+    was packed, so callers read them with `profile.icon_bytes`.
+    """
+    sources = {n: p for n in range(1, 16) if (p := profile.icon_path(n))}
+    if not sources:
+        return {}
+    preferred = cache_dir or _default_cache_dir(profile)
+    cache = _writable_cache_dir(preferred)
+    if cache is None:
+        return sources
+
+    index = _load_index(cache)
+    dirty = False
+    out: Dict[int, Path] = {}
+    for n, src in sources.items():
+        data: Optional[bytes] = None
+        try:
+            st = src.stat()
+            with _LOCK:
+                entry = index.get(str(src))
+            if entry and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size:
+                digest = entry["sha256"]
+            else:
+                data = src.read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                with _LOCK:
+                    index[str(src)] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+                dirty = True
+            out[n] = _materialize(cache, digest, size, lambda: data if data is not None else src.read_bytes())
+        except OSError as e:
+            logging.info("Icon %s not compiled (%s); using source", src, e)
+            out[n] = src
+            _forget_cache_dir(preferred)
+
+    if dirty:
+        _save_index(cache, index)
+    return out
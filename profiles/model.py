@@ -5,14 +5,20 @@ Profiles: model types
 Dataclasses for profile metadata and validation results.
 
 Classes:
-- Profile: folder key, label, icon paths, display names, etc.
-- ProfileReport: validation outcome (missing/extras/problems).
+- Profile: folder key, label, icon paths/bytes, display names, etc.
+  Profiles packed into the asset archive carry `archive` and read icons from it.
+- ProfileReport: validation outcome (missing/extras/problems, plus non-fatal warnings).
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Mapping, Optional, List, Set
+from typing import TYPE_CHECKING, Mapping, Optional, List, Set
+
+from services.archive import PROFILES_PREFIX
+
+if TYPE_CHECKING:
+    from services.archive import AssetArchive
 
 @dataclass(frozen=True)
 class Profile:
@@ -22,13 +28,35 @@ class Profile:
     names: Mapping[int, str]
     rest_label: str = "Rest"
     text_fallback: bool = True
+    archive: Optional["AssetArchive"] = None
 
     def icon_path(self, number: int) -> Optional[Path]:
-        if not (1 <= number <= 15):
+        """Path of a loose icon file (None for missing or archived icons)."""
+        if not (1 <= number <= 15) or self.archive is not None:
             return None
         p = (self.asset_dir / f"{number}.png").resolve()
         return p if p.exists() else None
 
+    def icon_bytes(self, number: int) -> Optional[bytes | memoryview]:
+        if not (1 <= number <= 15):
+            return None
+        if self.archive is not None:
+            return self.archive.read(f"{PROFILES_PREFIX}/{self.key}/{number}.png")
+        p = self.icon_path(number)
+        try:
+            return p.read_bytes() if p else None
+        except OSError:
+            return None
+
+    def file_names(self) -> List[str]:
+        """Names of the files in this profile (loose folder or archive)."""
+        if self.archive is not None:
+            return self.archive.listdir(f"{PROFILES_PREFIX}/{self.key}")
+        try:
+            return sorted(c.name for c in self.asset_dir.iterdir() if c.is_file())
+        except OSError:
+            return []
+
     def display_name_for(self, number: int) -> str:
         return self.names.get(number, str(number))
 
@@ -39,3 +67,4 @@ class ProfileReport:
     missing: Set[int]
     extras: List[str]
     problems: List[str]
+    warnings: List[str] = field(default_factory=list)
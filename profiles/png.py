@@ -0,0 +1,88 @@
+#profiles/png.py
+"""
+Profiles: PNG helpers
+=====================
+Tiny dependency-free helpers for the PNG container format. Only the chunk
+layer is handled here; pixel decoding is left to Pillow where it is needed.
+
+Exports:
+- PNG_SIGNATURE, IHDR_END
+- read_ihdr(head) -> (width, height, bit_depth, color_type, interlace)
+- iter_chunks(data) -> Iterator[(chunk_type, payload)]
+- recompress_png(data, level) -> bytes
+"""
+
+from __future__ import annotations
+from typing import Iterator, Tuple
+import struct, zlib
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IHDR_END = 33  # signature + IHDR chunk (length, type, 13-byte payload, CRC)
+
+# color type -> allowed bit depths (PNG spec, table 11.1)
+_DEPTHS = {0: {1, 2, 4, 8, 16}, 2: {8, 16}, 3: {1, 2, 4, 8}, 4: {8, 16}, 6: {8, 16}}
+
+# Ancillary chunks that change how the image is displayed; everything else
+# that is not critical (text, timestamps, DPI, ...) can be dropped.
+_KEEP_ANCILLARY = {b"tRNS", b"gAMA", b"sRGB", b"cHRM", b"iCCP"}
+
+def read_ihdr(head: bytes) -> Tuple[int, int, int, int, int]:
+    """
+    Parse the header from the first IHDR_END bytes of a file without touching
+    the image data. Raises ValueError when the header is missing or invalid.
+    """
+    head = bytes(head[:IHDR_END])
+    if head[:8] != PNG_SIGNATURE:
+        raise ValueError("Not a PNG file (bad signature).")
+    if len(head) < IHDR_END:
+        raise ValueError("Truncated PNG header.")
+    length, ctype = struct.unpack(">I4s", head[8:16])
+    if ctype != b"IHDR" or length != 13:
+        raise ValueError("First chunk is not a valid IHDR.")
+    if struct.unpack(">I", head[29:33])[0] != zlib.crc32(head[12:29]) & 0xFFFFFFFF:
+        raise ValueError("IHDR checksum mismatch.")
+    width, height, depth, color, comp, filt, interlace = struct.unpack(">IIBBBBB", head[16:29])
+    if not width or not height or width > 0x7FFFFFFF or height > 0x7FFFFFFF:
+        raise ValueError(f"Invalid dimensions {width}x{height}.")
+    if depth not in _DEPTHS.get(color, ()):
+        raise ValueError(f"Invalid bit depth {depth} for color type {color}.")
+    if comp or filt or interlace > 1:
+        raise ValueError("Unknown compression, filter or interlace method.")
+    return width, height, depth, color, interlace
+
+def iter_chunks(data: bytes) -> Iterator[Tuple[bytes, bytes]]:
+    """Yield (type, payload) for every chunk. Raises ValueError on a malformed file."""
+    if data[:8] != PNG_SIGNATURE:
+        raise ValueError("Not a PNG file (bad signature).")
+    pos = 8
+    while pos + 8 <= len(data):
+        length, ctype = struct.unpack(">I4s", data[pos:pos + 8])
+        end = pos + 12 + length
+        if end > len(data):
+            raise ValueError(f"Truncated {ctype!r} chunk.")
+        yield ctype, data[pos + 8:pos + 8 + length]
+        pos = end
+        if ctype == b"IEND":
+            return
+    raise ValueError("Missing IEND chunk.")
+
+def _chunk(ctype: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + ctype + payload + struct.pack(">I", zlib.crc32(ctype + payload) & 0xFFFFFFFF)
+
+def recompress_png(data: bytes, level: int = 9) -> bytes:
+    """
+    Lossless size reduction: drop non-visual ancillary chunks and re-deflate
+    the image data into a single IDAT at the given zlib level. Returns the
+    original bytes if the result would not be smaller.
+    """
+    head, idat, tail = [], [], []
+    for ctype, payload in iter_chunks(data):
+        if ctype == b"IDAT":
+            idat.append(payload)
+        elif ctype == b"IEND":
+            continue
+        elif ctype[0:1].isupper() or ctype in _KEEP_ANCILLARY:
+            (tail if idat else head).append(_chunk(ctype, payload))
+    raw = zlib.decompress(b"".join(idat))
+    out = b"".join([PNG_SIGNATURE, *head, _chunk(b"IDAT", zlib.compress(raw, level)), *tail, _chunk(b"IEND", b"")])
+    return out if len(out) < len(data) else data
@@ -3,7 +3,8 @@
 Profiles: in-memory registry
 ============================
 Holds the discovered profiles and precomputed validation reports.
-Provides helpers to fetch and refresh the registry.
+Provides helpers to fetch and refresh the registry. Profiles from the asset
+archive are included; a loose folder with the same key overrides them.
 
 Exports:
 - ASSETS_DIR
@@ -16,13 +17,21 @@ Exports:
 from __future__ import annotations
 from typing import Dict
 
-from .discover import resolve_assets_root, discover_profiles
-from .validate import report_for
+from services.archive import open_archive
+
+from .discover import resolve_assets_root, discover_profiles, discover_archive_profiles
+from .validate import report_for, report_all
 from .model import Profile, ProfileReport
 
+def _discover_all() -> Dict[str, Profile]:
+    archive = open_archive()
+    found = discover_archive_profiles(archive, ASSETS_DIR) if archive else {}
+    found.update(discover_profiles(ASSETS_DIR))
+    return dict(sorted(found.items()))
+
 ASSETS_DIR = resolve_assets_root()
-PROFILES: Dict[str, Profile] = discover_profiles(ASSETS_DIR)
-PROFILE_REPORTS: Dict[str, ProfileReport] = {k: report_for(v) for k, v in PROFILES.items()}
+PROFILES: Dict[str, Profile] = _discover_all()
+PROFILE_REPORTS: Dict[str, ProfileReport] = report_all(PROFILES)
 
 def get_profile(key: str) -> Profile:
     if key in PROFILES:
@@ -39,6 +48,6 @@ def get_profile_report(key: str) -> ProfileReport:
 def refresh_profiles() -> Dict[str, Profile]:
     """Re-discover profiles and rebuild reports; returns the new registry."""
     global PROFILES, PROFILE_REPORTS
-    PROFILES = discover_profiles(ASSETS_DIR)
-    PROFILE_REPORTS = {k: report_for(v) for k, v in PROFILES.items()}
+    PROFILES = _discover_all()
+    PROFILE_REPORTS = report_all(PROFILES)
     return PROFILES
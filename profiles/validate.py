@@ -5,38 +5,108 @@ Profiles: validation
 Validates a profile directory:
 - checks presence of 1.png..15.png
 - flags out-of-range numbered files
+- reads only the PNG signature + IHDR of each icon (33 bytes) to catch
+  corrupt files, oversized or 16-bit icons and mixed icon sizes
 - builds a human-readable problem list.
 
+Header results for loose files are cached by (size, mtime_ns), so
+re-validating after a refresh only re-reads icons that changed.
+
 Exports:
+- MAX_ICON_SIDE, MAX_ICON_BYTES
 - report_for(profile: Profile) -> ProfileReport
+- report_all(profiles: Mapping[str, Profile]) -> Dict[str, ProfileReport]   (parallel)
 """
 
 from __future__ import annotations
-from pathlib import Path
-import re
-from typing import List, Set
+import os, re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, Tuple, Union
 
 from .model import Profile, ProfileReport
+from .png import IHDR_END, read_ihdr
 
 _NUM_RE = re.compile(r"^(\d+)\.png$", re.IGNORECASE)
 
+MAX_ICON_SIDE = 1024            # exports show icons at 80px; anything larger is wasted bytes
+MAX_ICON_BYTES = 1 << 20
+
+# (file size, width, height, bit_depth, color_type) or the error message
+Header = Union[Tuple[int, int, int, int, int], str]
+_HEADER_CACHE: Dict[str, Tuple[int, int, Header]] = {}   # path -> (size, mtime_ns, header)
+
+def _scan(head: bytes, size: int) -> Header:
+    try:
+        w, h, depth, color, _ = read_ihdr(head)
+    except ValueError as e:
+        return str(e)
+    return size, w, h, depth, color
+
+def _icon_header(profile: Profile, n: int, name: str) -> Header:
+    if profile.archive is not None:
+        data = profile.icon_bytes(n)
+        return _scan(data[:IHDR_END], len(data)) if data is not None else "unreadable"
+    path = os.path.join(profile.asset_dir, name)
+    try:
+        st = os.stat(path)
+        hit = _HEADER_CACHE.get(path)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            return hit[2]
+        with open(path, "rb") as f:
+            header = _scan(f.read(IHDR_END), st.st_size)
+    except OSError as e:
+        return e.strerror or "unreadable"
+    _HEADER_CACHE[path] = (st.st_size, st.st_mtime_ns, header)
+    return header
+
+def _nums(ns: List[int]) -> str:
+    return ", ".join(map(str, ns)) if len(ns) <= 6 else f"{len(ns)} icons"
+
+def _scan_icons(profile: Profile, files: Dict[int, str]) -> Tuple[List[str], List[str]]:
+    """(problems, warnings) from the icon headers."""
+    problems: List[str] = []
+    warnings: List[str] = []
+    headers: Dict[int, Tuple[int, int, int, int, int]] = {}
+    for n in sorted(files):
+        h = _icon_header(profile, n, files[n])
+        if isinstance(h, str):
+            problems.append(f"Icon {n}.png is corrupt: {h}")
+        else:
+            headers[n] = h
+    if len(problems) > 6:
+        problems = [f"{len(problems)} icons are corrupt or unreadable."]
+
+    big = [n for n, (size, w, h, _, _) in headers.items() if max(w, h) > MAX_ICON_SIDE or size > MAX_ICON_BYTES]
+    if big:
+        warnings.append(f"Oversized icons (over {MAX_ICON_SIDE}px or {MAX_ICON_BYTES >> 20} MB): {_nums(big)}.")
+    deep = [n for n, (_, _, _, depth, _) in headers.items() if depth == 16]
+    if deep:
+        warnings.append(f"16-bit icons (8-bit is enough): {_nums(deep)}.")
+
+    sizes: Dict[Tuple[int, int], List[int]] = {}
+    for n, (_, w, h, _, _) in headers.items():
+        sizes.setdefault((w, h), []).append(n)
+    if len(sizes) > 1:
+        common = max(sizes, key=lambda k: len(sizes[k]))
+        odd = "; ".join(f"{_nums(ns)} {w}x{h}" for (w, h), ns in sizes.items() if (w, h) != common)
+        warnings.append(f"Mixed icon sizes: most are {common[0]}x{common[1]}, but {odd}.")
+    return problems, warnings
+
 def report_for(profile: Profile) -> ProfileReport:
-    present = {n for n in range(1, 16) if (profile.asset_dir / f"{n}.png").exists()}
+    names = profile.file_names()
+    present = {n for n in range(1, 16) if f"{n}.png" in names}  # exact case, like Profile.icon_path
     missing = {n for n in range(1, 16) if n not in present}
 
     extras: List[str] = []
-    try:
-        for child in profile.asset_dir.glob("*.png"):
-            m = _NUM_RE.match(child.name)
-            if m:
-                try:
-                    num = int(m.group(1))
-                    if num < 1 or num > 15:
-                        extras.append(child.name)
-                except Exception:
-                    pass
-    except Exception:
-        pass
+    for name in names:
+        m = _NUM_RE.match(name)
+        if m:
+            try:
+                num = int(m.group(1))
+                if num < 1 or num > 15:
+                    extras.append(name)
+            except Exception:
+                pass
 
     problems: List[str] = []
     if not present:
@@ -49,8 +119,18 @@ def report_for(profile: Profile) -> ProfileReport:
         problems.append(
             "Out-of-range files: " + ", ".join(sorted(extras)) + "." if len(extras) <= 6 else f"{len(extras)} out-of-range numbered files present."
         )
+    corrupt, warnings = _scan_icons(profile, {n: f"{n}.png" for n in present})
+    problems.extend(corrupt)
 
-    valid = (not missing) and (not extras)
+    valid = (not missing) and (not extras) and (not corrupt)
     return ProfileReport(
         key=profile.key, valid=valid, missing=missing, extras=extras, problems=problems or (["OK"] if valid else []),
+        warnings=warnings,
     )
+
+def report_all(profiles: Mapping[str, Profile]) -> Dict[str, ProfileReport]:
+    """Validate many profiles concurrently (header reads are I/O bound)."""
+    if len(profiles) <= 1:
+        return {k: report_for(v) for k, v in profiles.items()}
+    with ThreadPoolExecutor(max_workers=min(8, len(profiles))) as ex:
+        return dict(zip(profiles, ex.map(report_for, profiles.values())))
@@ -0,0 +1,157 @@
+#services/archive.py
+"""
+Asset archive
+=============
+Packs the `sntb-ui` icon folders and `docs` into one ZIP (stored, not
+compressed) so frozen builds read all assets through a single file. The
+central directory is parsed once; entries are served as zero-copy
+memoryview slices of a read-only memory map.
+
+Loose folders always win: callers consult them first and only fall back to
+the archive, so user-added profiles and edited docs keep working.
+
+Profile icons 1.png..15.png are stored already compiled to display size
+(see `profiles.icons.derive_icon`), so exports inline them straight from the
+map without an icon cache.
+
+Exports:
+- ARCHIVE_NAME, PROFILES_PREFIX, DOCS_PREFIX
+- AssetArchive(path): read(name), exists(name), listdir(prefix), close()
+- open_archive() -> Optional[AssetArchive]   (located once, then cached)
+- pack(out_path, sources) -> Path
+
+CLI:
+- python -m services.archive pack [--out sntb-assets.zip]
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+import logging, mmap, struct, sys, zipfile
+
+ARCHIVE_NAME = "sntb-assets.zip"
+PROFILES_PREFIX = "sntb-ui"
+DOCS_PREFIX = "docs"
+
+_LOCAL_HEADER = struct.Struct("<4s22xHH")  # signature ... name length, extra length
+
+class AssetArchive:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mm)
+            self._zip = zipfile.ZipFile(self._mm)
+        except Exception:
+            self._file.close()
+            raise
+        self._spans: Dict[str, Tuple[int, int]] = {}
+        self._children: Dict[str, Set[str]] = {}
+        for info in self._zip.infolist():
+            name = info.filename.rstrip("/")
+            parts = name.split("/")
+            for i in range(len(parts)):
+                self._children.setdefault("/".join(parts[:i]), set()).add(parts[i])
+            if info.is_dir() or info.compress_type != zipfile.ZIP_STORED:
+                continue
+            sig, n_len, x_len = _LOCAL_HEADER.unpack_from(self._mm, info.header_offset)
+            if sig != b"PK\x03\x04":
+                continue
+            start = info.header_offset + _LOCAL_HEADER.size + n_len + x_len
+            self._spans[name] = (start, start + info.file_size)
+
+    def close(self) -> None:
+        self._zip.close()
+        try:
+            self._view.release()
+            self._mm.close()
+        except BufferError:
+            pass  # slices still alive; the map is released with them
+        self._file.close()
+
+    def read(self, name: str) -> Optional[memoryview | bytes]:
+        """Entry contents (a zero-copy view for stored entries), or None."""
+        span = self._spans.get(name)
+        if span:
+            return self._view[span[0]:span[1]]
+        try:
+            return self._zip.read(name)
+        except KeyError:
+            return None
+
+    def exists(self, name: str) -> bool:
+        return name in self._spans or name.rstrip("/") in self._children
+
+    def listdir(self, prefix: str) -> List[str]:
+        """Immediate child names (files and folders) below prefix."""
+        return sorted(self._children.get(prefix.strip("/"), ()))
+
+def _candidate_paths() -> list[Path]:
+    here = Path(__file__).resolve()
+    c: list[Path] = []
+    if getattr(sys, "frozen", False):
+        c.append(Path(sys.executable).resolve().parent / ARCHIVE_NAME)
+    c += [here.parents[1] / ARCHIVE_NAME, Path.cwd() / ARCHIVE_NAME]
+    return list(dict.fromkeys(c))
+
+_ARCHIVE: Optional[AssetArchive] = None
+_SEARCHED = False
+
+def open_archive() -> Optional[AssetArchive]:
+    """Return the shared archive if one ships with the app, else None."""
+    global _ARCHIVE, _SEARCHED
+    if not _SEARCHED:
+        _SEARCHED = True
+        for p in _candidate_paths():
+            if p.is_file():
+                try:
+                    _ARCHIVE = AssetArchive(p)
+                    break
+                except (OSError, ValueError, zipfile.BadZipFile) as e:
+                    logging.info("Asset archive %s unusable: %s", p, e)
+    return _ARCHIVE
+
+def _release(path: Path) -> None:
+    """Unmap the shared archive if it is `path`, so it can be replaced (Windows refuses otherwise)."""
+    global _ARCHIVE, _SEARCHED
+    if _ARCHIVE is not None and _ARCHIVE.path.resolve() == path.resolve():
+        _ARCHIVE.close()
+        _ARCHIVE, _SEARCHED = None, False
+
+def pack(out_path: str | Path, sources: Dict[str, Path]) -> Path:
+    """
+    Write {prefix: folder} into a stored ZIP. Hidden files and Python sources
+    are skipped; numbered profile icons are written as compiled derivatives.
+    """
+    from profiles.icons import derive_icon  # imports the registry, which may map the old archive
+
+    icons = {f"{n}.png" for n in range(1, 16)}
+    out_path = Path(out_path)
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as zf:
+        for prefix, root in sources.items():
+            for f in sorted(root.rglob("*")):
+                rel = f.relative_to(root)
+                if not f.is_file() or f.suffix == ".py" or any(p.startswith(".") or p == "__pycache__" for p in rel.parts):
+                    continue
+                name = f"{prefix}/{rel.as_posix()}"
+                if prefix == PROFILES_PREFIX and len(rel.parts) == 2 and rel.name in icons:
+                    zf.writestr(zipfile.ZipInfo.from_file(f, name), derive_icon(f.read_bytes()))
+                else:
+                    zf.write(f, name)
+    _release(out_path)
+    tmp.replace(out_path)
+    return out_path
+
+if __name__ == "__main__":
+    import argparse
+    root = Path(__file__).resolve().parents[1]
+    ap = argparse.ArgumentParser(prog="python -m services.archive")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    pk = sub.add_parser("pack", help=f"pack {PROFILES_PREFIX}/ and {DOCS_PREFIX}/ into one archive")
+    pk.add_argument("--out", type=Path, default=root / ARCHIVE_NAME)
+    args = ap.parse_args()
+    from services.archive import pack  # the registry opens the archive through this module, not __main__
+    out = pack(args.out, {PROFILES_PREFIX: root / PROFILES_PREFIX, DOCS_PREFIX: root / DOCS_PREFIX})
+    print(f"Wrote {out} ({out.stat().st_size} bytes)")
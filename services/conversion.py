@@ -6,12 +6,36 @@ Thin orchestrator that wires loader → mapper → exporter into one call.
 
 Class:
 - ConversionService: convert(in_file, out_file, title, profile) -> Path
+  plus asyncio counterparts:
+  - convert_async(...)  parses in an executor and writes on a worker thread,
+    so the event loop never blocks on parsing or file I/O
+  - convert_many(jobs, limit, ...)  runs many conversions with at most
+    `limit` in flight; one job's export overlaps with other jobs' parsing.
+    Cancel it by setting the `cancel` event or cancelling the awaiting task.
+
+Pass a ProcessPoolExecutor to spread parsing over CPU cores (loader and
+mapper must then be picklable, which the module-level defaults are); with the
+default thread pool, parsing still leaves the event loop free.
 """
 
 from __future__ import annotations
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable, List, Optional, Union
+import asyncio, functools
+
+from main import DEFAULT_TITLE
+
 from .interfaces import Loader, Mapper, Exporter, ActiveMap
 
+@dataclass(frozen=True)
+class ConversionJob:
+    in_file: str
+    out_file: str | Path
+    title: str = DEFAULT_TITLE
+    profile: str = ""
+
 class ConversionService:
     def __init__(self, loader: Loader, mapper: Mapper, exporter: Exporter):
         self.loader = loader
@@ -23,3 +47,49 @@ class ConversionService:
         mapped: ActiveMap = self.mapper(raw, profile=profile)
         out_path: Path = self.exporter(mapped, out_file, title=title, profile=profile)
         return out_path
+
+    def _load_and_map(self, in_file: str, profile: str) -> ActiveMap:
+        return self.mapper(self.loader(in_file), profile=profile)
+
+    async def convert_async(self, in_file: str, out_file: str | Path, title: str, profile: str,
+                            executor: Optional[Executor] = None,
+                            cancel: Optional[asyncio.Event] = None) -> Path:
+        loop = asyncio.get_running_loop()
+        if executor is None:
+            mapped = await loop.run_in_executor(None, self._load_and_map, in_file, profile)
+        else:
+            # only plain callables cross a process boundary; map after parsing
+            raw = await loop.run_in_executor(executor, self.loader, in_file)
+            mapped = self.mapper(raw, profile=profile)
+        if cancel is not None and cancel.is_set():
+            raise asyncio.CancelledError(f"Conversion of {in_file} cancelled before export.")
+        write = functools.partial(self.exporter, mapped, out_file, title=title, profile=profile)
+        return await loop.run_in_executor(None, write)
+
+    async def convert_many(self, jobs: Iterable[ConversionJob], limit: int = 4,
+                           executor: Optional[Executor] = None,
+                           cancel: Optional[asyncio.Event] = None) -> List[Union[Path, BaseException]]:
+        """
+        Convert every job with at most `limit` running at once. Results keep job
+        order; a failed or cancelled job yields its exception instead of a path.
+        Jobs that have not started when `cancel` is set are skipped; running
+        parses finish in their executor but their exports are not written.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        sem = asyncio.Semaphore(limit)
+
+        async def run(job: ConversionJob) -> Path:
+            async with sem:
+                if cancel is not None and cancel.is_set():
+                    raise asyncio.CancelledError(f"Conversion of {job.in_file} cancelled.")
+                return await self.convert_async(job.in_file, job.out_file, job.title, job.profile,
+                                                executor=executor, cancel=cancel)
+
+        tasks = [asyncio.ensure_future(run(j)) for j in jobs]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            for t in tasks:
+                t.cancel()
+            raise
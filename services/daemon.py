@@ -0,0 +1,214 @@
+#services/daemon.py
+"""
+Conversion daemon
+=================
+Keeps the conversion pipeline warm in one long-lived process so scripted,
+one-file-at-a-time conversions skip imports and profile discovery/validation.
+
+- The daemon listens on a Unix domain socket (mode 0600) and exits after
+  `idle_timeout` seconds without requests.
+- Protocol: one JSON object per line each way.
+    {"op": "convert", "in": ..., "out": ..., "title": ..., "profile": ...}
+        -> {"ok": true, "out": "...", "ms": 12.3} | {"ok": false, "error": "..."}
+    {"op": "ping"} / {"op": "refresh"} (re-discover profiles) / {"op": "stop"}
+  A convert request naming a profile the daemon does not know re-discovers
+  profiles first, so newly added profile folders behave as in-process. A key
+  that is still unknown is not looked for again until the profiles folder
+  changes (its mtime) or a "refresh" arrives.
+- Clients send absolute paths; the daemon's working directory is irrelevant.
+- This module imports only the standard library; the pipeline is imported by
+  the daemon itself, so a client stays as cheap as interpreter startup.
+
+Platforms without AF_UNIX (Windows) have no daemon; clients fall back to
+in-process conversion.
+
+Exports:
+- DEFAULT_IDLE_TIMEOUT, CONVERT_TIMEOUT
+- socket_path() -> Optional[Path]
+- request(message, path=None, timeout=None) -> Optional[dict]
+- convert_via_daemon(in_file, out_file, title, profile, timeout=CONVERT_TIMEOUT) -> Optional[Path]
+- serve(path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT) -> None
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Optional
+import json, os, socket, threading, time   # client path: keep imports minimal
+
+DEFAULT_IDLE_TIMEOUT = 600.0
+CONVERT_TIMEOUT = 120.0    # client gives up on a hung daemon (an error: it may still write `out`)
+_ENV_SOCKET = "SNTB_DAEMON_SOCKET"
+
+def socket_path() -> Optional[Path]:
+    """Per-user socket location, or None when Unix sockets are unavailable."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    if os.environ.get(_ENV_SOCKET):
+        return Path(os.environ[_ENV_SOCKET])
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return Path(runtime) / "sntb.sock"
+    return _fallback_dir() / "sntb.sock"
+
+def _fallback_dir() -> Path:
+    """Private per-user directory in the shared temp dir; the daemon creates it with mode 0700."""
+    import tempfile
+    return Path(tempfile.gettempdir()) / f"sntb-{os.getuid()}"
+
+def _owned(path: Path) -> bool:
+    """True if path exists and belongs to the current user (another user could pre-create it)."""
+    try:
+        return os.stat(path).st_uid == os.getuid()
+    except OSError:
+        return False
+
+def _send(conn: socket.socket, message: dict) -> None:
+    conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+def _recv(conn: socket.socket) -> Optional[dict]:
+    line = conn.makefile("rb").readline()
+    return json.loads(line) if line else None
+
+def request(message: dict, path: Optional[Path] = None, timeout: Optional[float] = None) -> Optional[dict]:
+    """
+    Send one message. None if no usable daemon answers: no socket, a socket
+    owned by another user, or a daemon that refuses or drops the connection
+    or replies with garbage. RuntimeError if the daemon took the message but
+    did not reply within `timeout`: it may still act on it, so callers must
+    not silently redo the work.
+    """
+    path = path or socket_path()
+    if path is None or not _owned(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(path))
+            _send(conn, message)
+            try:
+                reply = _recv(conn)
+            except socket.timeout:
+                raise RuntimeError(f"Daemon on {path} did not reply within {timeout:g}s; "
+                                   "it may still be working on the request.") from None
+    except (OSError, ValueError):  # any socket error (permissions, timeouts, resets); bad JSON or UTF-8
+        return None
+    return reply if isinstance(reply, dict) else None
+
+def convert_via_daemon(in_file: str | Path, out_file: str | Path, title: str, profile: str,
+                       timeout: Optional[float] = CONVERT_TIMEOUT) -> Optional[Path]:
+    """Convert through a running daemon. None if there is none; RuntimeError if it fails the job or times out."""
+    reply = request({"op": "convert", "in": str(Path(in_file).resolve()), "out": str(Path(out_file).resolve()),
+                     "title": title, "profile": profile}, timeout=timeout)
+    if reply is None:
+        return None
+    if not reply.get("ok"):
+        raise RuntimeError(reply.get("error") or "Daemon conversion failed.")
+    return Path(reply["out"])
+
+def _bind(path: Path) -> socket.socket:
+    if path.parent == _fallback_dir():
+        path.parent.mkdir(mode=0o700, exist_ok=True)
+        if not _owned(path.parent) or os.stat(path.parent).st_mode & 0o077:
+            raise RuntimeError(f"{path.parent} is not a private directory of this user; refusing to listen there.")
+    if path.exists() or path.is_symlink():
+        if not _owned(path):
+            raise RuntimeError(f"Socket {path} belongs to another user.")
+        if request({"op": "ping"}, path, timeout=2.0) is not None:
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        path.unlink()  # stale socket from a crashed daemon
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old = os.umask(0o177)
+    try:
+        srv.bind(str(path))
+    finally:
+        os.umask(old)
+    os.chmod(path, 0o600)
+    srv.listen(16)
+    return srv
+
+def serve(path: Optional[Path] = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """Run the daemon until it is idle for `idle_timeout` seconds or receives "stop"."""
+    path = path or socket_path()
+    if path is None:
+        raise RuntimeError("This platform has no Unix domain sockets; the daemon is unavailable.")
+
+    import logging
+
+    # warm everything a conversion needs (imports, profile discovery + validation)
+    from main.loader import load_active_map
+    from main.mapper import map_active_map
+    from main.exporter import export_html_stack
+    from profiles import refresh_profiles, registry
+    from main import DEFAULT_TITLE
+    from .conversion import ConversionService
+    service = ConversionService(load_active_map, map_active_map, export_html_stack)
+
+    srv = _bind(path)
+    srv.settimeout(1.0)
+    state = {"last": time.monotonic(), "busy": 0, "stop": False}
+    lock = threading.Lock()
+    misses: Dict[str, Optional[int]] = {}   # unknown profile key -> profiles folder mtime when last looked for
+
+    def assets_mtime() -> Optional[int]:
+        try:
+            return os.stat(registry.ASSETS_DIR).st_mtime_ns
+        except OSError:
+            return None
+    logging.info("Daemon listening on %s (idle timeout %.0fs)", path, idle_timeout)
+
+    def handle(conn: socket.socket) -> None:
+        with conn:
+            try:
+                msg = _recv(conn) or {}
+                op = msg.get("op")
+                if op == "convert":
+                    t0 = time.perf_counter()
+                    key = msg.get("profile")
+                    if key and key not in registry.PROFILES:
+                        stamp = assets_mtime()
+                        if key not in misses or misses[key] != stamp:
+                            refresh_profiles()  # added since startup? unknown keys still fall back like in-process
+                            if key not in registry.PROFILES:
+                                misses[key] = stamp
+                    out = service.convert(msg["in"], msg["out"], title=msg.get("title") or DEFAULT_TITLE,
+                                          profile=msg.get("profile") or "")
+                    reply = {"ok": True, "out": str(out), "ms": round((time.perf_counter() - t0) * 1000, 1)}
+                elif op == "refresh":
+                    misses.clear()
+                    reply = {"ok": True, "profiles": sorted(refresh_profiles())}
+                elif op in ("ping", "stop"):
+                    reply = {"ok": True, "pid": os.getpid()}
+                    state["stop"] = op == "stop"
+                else:
+                    reply = {"ok": False, "error": f"Unknown op: {op!r}"}
+            except Exception as e:
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            try:
+                _send(conn, reply)
+            except OSError:
+                pass
+        with lock:
+            state["busy"] -= 1
+            state["last"] = time.monotonic()
+
+    try:
+        while not state["stop"]:
+            try:
+                conn, _ = srv.accept()
+            except socket.timeout:
+                with lock:
+                    if not state["busy"] and time.monotonic() - state["last"] > idle_timeout:
+                        logging.info("Daemon idle for %.0fs, shutting down", idle_timeout)
+                        break
+                continue
+            conn.settimeout(None)
+            with lock:
+                state["busy"] += 1
+                state["last"] = time.monotonic()
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+    finally:
+        srv.close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
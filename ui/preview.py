@@ -0,0 +1,159 @@
+#ui/preview.py
+"""
+UI helpers (sheet preview)
+==========================
+Scrollable Canvas that previews mapped bars with a profile's icons, laid out
+like the exported `.card`/`.stack` grid.
+
+Only rows inside the viewport are drawn; each profile's icons are loaded into
+PhotoImages once and reused, so switching profiles or scrolling a long song
+never touches the input file again.
+
+Exports:
+- SheetPreview(parent): ttk.Frame with set_mapping(mapping), set_profile(profile), clear_cache()
+"""
+
+from __future__ import annotations
+from bisect import bisect_right
+from typing import Dict, List, Optional, Union
+import base64, logging, math
+import tkinter as tk
+from tkinter import ttk
+
+from profiles import Profile, compile_profile
+
+ActiveMap = Dict[int, Union[List[int], str]]
+
+ICON = 40          # preview icon edge (px)
+GAP = 4
+PAD = 4
+TITLE_H = 16
+REST_H = 24
+CARD_W = ICON + 2 * PAD
+
+BG = "#1e242b"; CARD_BG = "#151719"; BORDER = "#2a2f34"; TITLE_FG = "#98f5c4"; MUTED = "#8b929a"
+
+class SheetPreview(ttk.Frame):
+    def __init__(self, parent, **kw):
+        super().__init__(parent, **kw)
+        self.canvas = tk.Canvas(self, background=BG, highlightthickness=0, height=220)
+        self.vbar = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.canvas.configure(yscrollcommand=self.vbar.set)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.vbar.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1); self.rowconfigure(0, weight=1)
+
+        self._bars: List[tuple] = []               # [(bar_index, fields or "noValue")]
+        self._profile: Optional[Profile] = None
+        self._images: Dict[str, Dict[int, tk.PhotoImage]] = {}
+        self._row_tops: List[int] = [0]            # y of each row; last entry == total height
+        self._cols = 1
+
+        self.canvas.bind("<Configure>", lambda e: self._relayout())
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind(seq, self._on_wheel)
+
+    # ------- public
+    def set_mapping(self, mapping: Optional[ActiveMap]) -> None:
+        self._bars = [(k, mapping[k]) for k in sorted(mapping)] if mapping else []
+        self.canvas.yview_moveto(0)
+        self._relayout()
+
+    def set_profile(self, profile: Optional[Profile]) -> None:
+        self._profile = profile
+        self._redraw()
+
+    def clear_cache(self) -> None:
+        """Forget loaded icons (e.g. after profiles were reloaded)."""
+        self._images.clear()
+        self._redraw()
+
+    # ------- icons
+    def _icons(self) -> Dict[int, tk.PhotoImage]:
+        prof = self._profile
+        if prof is None:
+            return {}
+        cache = self._images.get(prof.key)
+        if cache is None:
+            cache = {}
+            compiled = compile_profile(prof, size=ICON)
+            for num in range(1, 16):
+                path = compiled.get(num)
+                try:
+                    if path is not None:
+                        img = tk.PhotoImage(master=self.canvas, file=str(path))
+                    elif (data := prof.icon_bytes(num)) is not None:  # archived: compiled at pack time
+                        img = tk.PhotoImage(master=self.canvas, data=base64.b64encode(data).decode("ascii"))
+                    else:
+                        continue
+                    factor = math.ceil(max(img.width(), img.height()) / ICON)
+                    cache[num] = img.subsample(factor) if factor > 1 else img
+                except tk.TclError as e:
+                    logging.info("Preview icon %d of '%s' not loaded: %s", num, prof.key, e)
+            self._images[prof.key] = cache
+        return cache
+
+    # ------- layout / drawing
+    @staticmethod
+    def _card_h(val) -> int:
+        body = REST_H if val == "noValue" else len(val) * (ICON + GAP) - GAP
+        return TITLE_H + body + 2 * PAD
+
+    def _relayout(self) -> None:
+        width = max(self.canvas.winfo_width(), CARD_W + GAP)
+        self._cols = max(1, (width - GAP) // (CARD_W + GAP))
+        tops = [GAP]
+        for i in range(0, len(self._bars), self._cols):
+            row_h = max(self._card_h(v) for _, v in self._bars[i:i + self._cols])
+            tops.append(tops[-1] + row_h + GAP)
+        self._row_tops = tops
+        self.canvas.configure(scrollregion=(0, 0, width, tops[-1]))
+        self._redraw()
+
+    def _redraw(self) -> None:
+        c = self.canvas
+        c.delete("all")
+        if not self._bars:
+            c.create_text(12, 12, anchor="nw", fill=MUTED, text="Pick an input file to preview it here.")
+            return
+
+        y0 = c.canvasy(0)
+        y1 = y0 + c.winfo_height()
+        first = max(0, bisect_right(self._row_tops, y0) - 1)
+        last = min(len(self._row_tops) - 1, bisect_right(self._row_tops, y1))
+        icons = self._icons()
+        prof = self._profile
+
+        for row in range(first, last):
+            top = self._row_tops[row]
+            for col, (idx, val) in enumerate(self._bars[row * self._cols:(row + 1) * self._cols]):
+                x = GAP + col * (CARD_W + GAP)
+                c.create_rectangle(x, top, x + CARD_W, top + self._card_h(val), outline=BORDER, fill=CARD_BG)
+                c.create_text(x + PAD, top + PAD, anchor="nw", fill=TITLE_FG, text=str(idx), font=("TkDefaultFont", 8, "bold"))
+                y = top + PAD + TITLE_H
+                if val == "noValue":
+                    label = prof.rest_label if prof else "Rest"
+                    c.create_text(x + CARD_W // 2, y + REST_H // 2, fill=MUTED, text=label, font=("TkDefaultFont", 8, "italic"))
+                    continue
+                for num in val:
+                    img = icons.get(num)
+                    if img is not None:
+                        c.create_image(x + PAD, y, anchor="nw", image=img)
+                    else:
+                        c.create_rectangle(x + PAD, y, x + PAD + ICON, y + ICON, outline=BORDER)
+                        label = prof.display_name_for(num) if prof else str(num)
+                        c.create_text(x + PAD + ICON // 2, y + ICON // 2, fill="#dfe3e6", text=label)
+                    y += ICON + GAP
+
+    def _yview(self, *args) -> None:
+        self.canvas.yview(*args)
+        self._redraw()
+
+    def _on_wheel(self, e) -> None:
+        if getattr(e, "num", None) == 4:
+            step = -1
+        elif getattr(e, "num", None) == 5:
+            step = 1
+        else:
+            step = -1 if e.delta > 0 else 1
+        self._yview("scroll", step * 3, "units")